@@ -1,21 +1,76 @@
 import streamlit as st 
-from src.data.database import get_session, init_database
+from src.data.database import get_engine, get_session, init_database
 from src.data.models import Instrument, PriceDaily
 from src.data.sources.stub_source import StubSource
 from src.data.sources.fred_source import FREDSource
 from src.data.sources.yfinance_source import YFinanceSource
 from src.data.sources.base import DataSource_error
 from src.data.etl.pipeline import ETLPipeline
-from src.analytics.features import FeatureEngine
+from src.analytics.features import FeatureEngine, FEATURES_VERSION
+from src.analytics.warmup import warmup_kernels
 from src.analytics.signals import SignalCombiner, MomentumSignal, RSISignal, MACDSignal
 from src.trading.backtest import BacktestEngine, run_backtest, plot_backtest_results
 from src.trading.diagnostics import DiagnosticEngine
 from datetime import datetime, timedelta, date
 import traceback
-from src.trading.backtest_helpers import load_multi_asset_prices, build_signals_for_symbol
+from src.trading.backtest_helpers import load_multi_asset_prices, build_signals
+import numpy as np
 import pandas as pd
+from sqlalchemy import func, select
 
-init_database()
+CACHE_TTL_SECONDS = 3600
+
+def _hash_price_df(df: pd.DataFrame):
+    """Cheap cache key for a price frame: shape, date span and content hash."""
+    return (tuple(df.columns), df.index[0], df.index[-1], int(pd.util.hash_pandas_object(df, index=True).sum()))
+
+def price_data_version(session, instruments) -> tuple:
+    """Row count and latest date of the instruments' prices, so a cached frame is dropped once their data changes."""
+    stmt = select(func.count(), func.max(PriceDaily.date)).where(
+        PriceDaily.instrument_id.in_([inst.id for inst in instruments])
+    )
+    return tuple(session.execute(stmt).one())
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS)
+def cached_multi_asset_prices(_session, _instruments, symbols: tuple, data_version: tuple):
+    """load_multi_asset_prices cached per symbol set and data version; also cleared when new data is loaded."""
+    return load_multi_asset_prices(_session, _instruments, list(symbols))
+
+@st.cache_resource
+def get_combiner(momentum_window: int, rsi_oversold: float, rsi_overbought: float) -> SignalCombiner:
+    """One SignalCombiner per parameter set, shared across reruns and sessions."""
+    return SignalCombiner(
+        signals={
+            "momentum": MomentumSignal(window=momentum_window),
+            "rsi": RSISignal(oversold=rsi_oversold, overbought=rsi_overbought),
+            "macd": MACDSignal(),
+        }
+    )
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, hash_funcs={pd.DataFrame: _hash_price_df})
+def cached_signals(price_df: pd.DataFrame, params: tuple, features_version: int) -> pd.DataFrame:
+    """Features + combined signals for price_df, reused across reruns until prices or params change."""
+    return build_signals(FeatureEngine(), price_df, get_combiner(*params))
+
+@st.cache_resource
+def get_db_engine():
+    """
+    Create tables and the pooled engine once per server process.
+
+    Reruns reuse the engine (and its connection pool) instead of running
+    create_all's schema checks again. Sessions stay per-run via get_session(),
+    since a Session must not be shared between Streamlit's session threads.
+    """
+    init_database()
+    return get_engine()
+
+@st.cache_resource
+def warm_kernels() -> bool:
+    """Warm the feature kernels once per server process, not on every rerun."""
+    return warmup_kernels()
+
+get_db_engine()
+warm_kernels()
 st.sidebar.title("QuantPlatform - Systematic Trading Data Platform")
 page = st.sidebar.radio("Go to", ["Data", "Backtest", "Analytics"])
 
@@ -34,16 +89,16 @@ if page == "Data":
                 if not instrument:
                     st.error(f"Instrument {symbol} not found in database")
                 else:
-                    price_rows = session.query(PriceDaily).filter(PriceDaily.instrument_id == instrument.id).order_by(PriceDaily.date).all()
-                    if not price_rows:
+                    stmt = (
+                        select(PriceDaily.date, PriceDaily.open, PriceDaily.high, PriceDaily.low, PriceDaily.close, PriceDaily.volume)
+                        .where(PriceDaily.instrument_id == instrument.id)
+                        .order_by(PriceDaily.date)
+                    )
+                    price_df = pd.read_sql(stmt, session.connection(), index_col="date", parse_dates=["date"])
+                    if price_df.empty:
                         st.error("No price data found for this symbol")
                     else:
-                        st.write(f"Found {len(price_rows)} price records for {symbol}")
-                        price_df = pd.DataFrame([
-                            {"date": p.date, "open": p.open, "high": p.high, "low": p.low, "close": p.close, "volume": p.volume}
-                            for p in price_rows
-                        ])
-                        price_df = price_df.set_index("date").sort_index()
+                        st.write(f"Found {len(price_df)} price records for {symbol}")
                         st.line_chart(price_df[["close"]])
 
     st.subheader("Load Data")
@@ -72,6 +127,7 @@ if page == "Data":
             start_date = end_date - timedelta(days=days)
             pipeline = ETLPipeline()
             stats = pipeline.run(symbols, start_date, end_date)
+            cached_multi_asset_prices.clear()
             st.session_state['last_load_stats'] = stats
             st.rerun()
 
@@ -107,27 +163,27 @@ elif page == "Backtest":
                     if not instruments:
                         st.error("No instruments found in database for selected symbols")
                     else:
-                        price_df = load_multi_asset_prices(session, instruments, symbols)
+                        price_df = cached_multi_asset_prices(
+                            session, instruments, tuple(sorted(symbols)), price_data_version(session, instruments)
+                        )
                         if price_df is None or price_df.empty:
                             st.error("No price data found for any symbol. Load data first.")
                         else:
-                            price_df = price_df.dropna().sort_index()
-                            price_df = price_df.loc[start_date:end_date]
+                            # The loader returns a sorted, filled frame; only pay for these when needed
+                            if not price_df.index.is_monotonic_increasing:
+                                price_df = price_df.sort_index()
+                            if np.isnan(price_df.to_numpy()).any():
+                                price_df = price_df.dropna()
+                            # Index is sorted, so two binary searches give the date range as a positional slice
+                            start_pos = price_df.index.searchsorted(start_date, side="left")
+                            end_pos = price_df.index.searchsorted(end_date, side="right")
+                            price_df = price_df.iloc[start_pos:end_pos]
                             if price_df.empty:
                                 st.error("No price data in selected date range")
                             else:
-                                engine = FeatureEngine()
-                                signal_combiner = SignalCombiner(
-                                    signals={
-                                        "momentum": MomentumSignal(window=21),
-                                        "rsi": RSISignal(oversold=30, overbought=70),
-                                        "macd": MACDSignal(),
-                                    }
-                                )
-                                signals_df = pd.DataFrame(
-                                    {sym: build_signals_for_symbol(engine, price_df[sym], signal_combiner) for sym in price_df.columns}
-                                )
-                                signals_df = signals_df.reindex(price_df.index).ffill().fillna(0)
+                                signals_df = cached_signals(price_df, (21, 30, 70), FEATURES_VERSION)
+                                # Signals are only -1/0/+1; int8 keeps the T x K frame small
+                                signals_df = signals_df.reindex(price_df.index).ffill().fillna(0).astype(np.int8)
 
                                 bt_engine = BacktestEngine(
                                     initial_capital=initial_capital,
@@ -190,8 +246,7 @@ elif page == "Analytics":
         st.line_chart(result.equity.to_frame("equity"))
 
         st.subheader("Drawdown")
-        drawdown = (result.equity - result.equity.cummax()) / result.equity.cummax()
-        st.line_chart(drawdown.to_frame("drawdown"))
+        st.line_chart(result.drawdowns.to_frame("drawdown"))
 
         st.subheader("Per-asset equity")
         st.line_chart(result.per_asset_equity)
@@ -12,23 +12,30 @@ Usage:
 import sys
 sys.path.insert(0, ".")
 
+import logging
+
 import click 
 from datetime import date, timedelta
-from tabulate import tabulate
 
-from src.data.database import get_session, init_database
-from src.data.models import Instrument, PriceDaily, DataLoadLog, DataLoadSymbol
-from src.data.etl.pipeline import ETLPipeline
+# Heavier imports (pandas, SQLAlchemy models, the ETL stack, tabulate) live
+# inside the commands that use them, so `--help` and simple listings start fast.
 
 @click.group()
 @click.version_option(version="0.1.0", prog_name="QuantPlatform")
-def cli():
+@click.option(
+    "--log-level",
+    type=click.Choice(["DEBUG", "INFO", "WARNING", "ERROR"], case_sensitive=False),
+    default="INFO",
+    show_default=True,
+    help="Verbosity of ETL progress messages",
+)
+def cli(log_level):
     """
     QuantPlatform - Systematic Trading Data Platform
 
     A professional data pipeline for quantitative trading.
     """
-    pass 
+    logging.basicConfig(level=log_level.upper(), format="%(message)s")
 
 # ============================================================
 # DATA COMMANDS
@@ -77,6 +84,8 @@ def load_data(symbols, days, start_date, end_date, skip_existing):
         click.echo(f"Error: Start date cannot be after end date")
         return
     
+    from src.data.etl.pipeline import ETLPipeline
+
     # Run the pipeline
     pipeline = ETLPipeline()
     stats = pipeline.run(list(symbols), start_date, end_date, skip_existing=skip_existing)
@@ -101,6 +110,10 @@ def data_list(prices):
         quant data list
         quant data list --prices
     """
+    from tabulate import tabulate
+    from src.data.database import get_session, init_database
+    from src.data.models import Instrument, PriceDaily
+
     init_database()
 
     with get_session() as session:
@@ -143,6 +156,9 @@ def data_status(limit):
         quant data status
         quant data status --limit 20
     """
+    from tabulate import tabulate
+    from src.data.database import get_session, init_database
+    from src.data.models import DataLoadLog, DataLoadSymbol
 
     init_database()
 
@@ -186,6 +202,12 @@ def data_query(symbol, days):
         quant data query AAPL
         quant data query AAPL --days 30
     """
+    import pandas as pd
+    from sqlalchemy import select
+    from tabulate import tabulate
+    from src.data.database import get_session, init_database
+    from src.data.models import Instrument, PriceDaily
+
     init_database()
 
     with get_session() as session:
@@ -196,38 +218,46 @@ def data_query(symbol, days):
             return
 
         #Get prices
-        prices = (
-            session.query(PriceDaily)
-            .filter_by(instrument_id=instrument.id)
+        stmt = (
+            select(
+                PriceDaily.date,
+                PriceDaily.open,
+                PriceDaily.high,
+                PriceDaily.low,
+                PriceDaily.close,
+                PriceDaily.volume,
+                PriceDaily.adj_close,
+            )
+            .where(PriceDaily.instrument_id == instrument.id)
             .order_by(PriceDaily.date.desc())
             .limit(days)
-            .all()
         )
+        prices = pd.read_sql(stmt, session.connection(), parse_dates=["date"])
 
-        if not prices:
+        if prices.empty:
             click.echo(f"No price data found for {symbol}.")
             return
 
         click.echo(f"\n{symbol} - {instrument.name}")
         click.echo(f"{'=' * 60}")
 
-        rows = []
-        for p in reversed(prices):
-            rows.append([
-                p.date.strftime("%Y-%m-%d"),
-                f"${p.open:,.2f}" if p.open else "-",
-                f"${p.high:,.2f}" if p.high else "-",
-                f"${p.low:,.2f}" if p.low else "-",
-                f"${p.close:,.2f}" if p.close else "-",
-                f"{p.volume:,.0f}" if p.volume else "-",
-                f"${p.adj_close:,.2f}" if p.adj_close else "-",
-            ])
+        # Format whole columns at once; missing or zero values show as "-"
+        prices["date"] = prices["date"].dt.strftime("%Y-%m-%d")
+        for col in ["open", "high", "low", "close", "adj_close"]:
+            prices[col] = _format_column(prices[col], "${:,.2f}")
+        prices["volume"] = _format_column(prices["volume"], "{:,.0f}")
+        rows = prices[::-1].values.tolist()
 
         headers = ["Date", "Open", "High", "Low", "Close", "Volume", "Adj Close"]
         click.echo()
         click.echo(tabulate(rows, headers=headers, tablefmt="simple_grid"))
 
 
+def _format_column(values: "pd.Series", fmt: str) -> "pd.Series":
+    """Format a numeric column with fmt, using "-" for missing or zero values."""
+    return values.map(fmt.format, na_action="ignore").where(values.notna() & (values != 0), "-")
+
+
 # ============================================================
 # MAIN ENTRY POINT
 # ============================================================
@@ -0,0 +1,508 @@
+"""
+Compiled kernels for recursive indicators.
+
+Wilder smoothing (RSI, ATR) and the MACD EMAs are recurrences, so pandas can
+only run them through its generic ewm machinery. These kernels walk a
+contiguous float64 array once.
+
+Kernels are compiled with numba when it is installed; otherwise they run as
+plain Python with identical results. Each kernel is declared with an explicit
+signature, so numba compiles it eagerly at import (or loads it from the on-disk
+cache) and calls skip type dispatch. Array arguments must be C-contiguous
+float64; the backtest kernels work on float32 (dates x symbols) panels, and
+strategy_returns_kernel also takes int8 signals. fastmath is left off because
+the kernels rely on NaN checks.
+"""
+
+import os
+import threading
+
+import numpy as np
+
+try:
+    from numba import config, njit, prange, types
+    NUMBA_AVAILABLE = True
+
+    # The TBB layer keeps the process from exiting once a parallel kernel has
+    # run on a Streamlit script thread; prefer the others unless one is forced.
+    if 'NUMBA_THREADING_LAYER' not in os.environ:
+        config.THREADING_LAYER_PRIORITY = ['omp', 'workqueue', 'tbb']
+
+    # Inputs are typed read-only so pandas' read-only (copy-on-write) arrays
+    # match without a copy; writable arrays are accepted for them as well.
+    _F8 = types.float64
+    _I8 = types.int64
+    _IN = types.Array(_F8, 1, 'C', readonly=True)
+    _OUT = _F8[::1]
+    SIG_EWM_STEP = types.UniTuple(_F8, 2)(_F8, _F8, _F8, _F8)
+    SIG_EMA = _OUT(_IN, _F8)
+    SIG_RSI = _OUT(_IN, _I8)
+    SIG_ATR = _OUT(_IN, _IN, _IN, _I8)
+    SIG_MACD = types.UniTuple(_OUT, 5)(_IN, _F8, _F8, _F8)
+    _IN_2D = types.Array(_F8, 2, 'A', readonly=True)
+    _IN_F4 = types.Array(types.float32, 1, 'C', readonly=True)
+    SIG_SIGNALS = types.int8[:, ::1](_IN_2D, _IN_2D, _IN_2D, _IN_2D, _IN_F4, _F8, _F8, _F8, _F8)
+    SIG_ROLLING_MEAN_COL = types.void(types.Array(_F8, 1, 'A', readonly=True), _I8, _F8[:])
+    SIG_ROLLING_STD_COL = [
+        types.void(types.Array(_F8, 1, 'A', readonly=True), _I8, _I8, _F8[:]),
+        types.void(types.Array(types.float32, 1, 'A', readonly=True), _I8, _I8, _F8[:]),
+    ]
+    _OUT_2D = _F8[::1, :]
+    SIG_RSI_2D = _OUT_2D(_IN_2D, _I8)
+    SIG_ATR_2D = _OUT_2D(_IN_2D, _IN_2D, _IN_2D, _I8)
+    SIG_MACD_2D = types.UniTuple(_OUT_2D, 5)(_IN_2D, _F8, _F8, _F8)
+    SIG_ROLLING_MEAN = _F8[::1, :](_IN_2D, _I8)
+    SIG_ROLLING_STD = _F8[::1, :](_IN_2D, _I8, _I8)
+    _PANEL_F4 = types.float32[::1, :]
+    SIG_STRATEGY_RETURNS = [
+        types.UniTuple(_PANEL_F4, 3)(_IN_2D, types.Array(types.float32, 2, 'A', readonly=True), _F8),
+        types.UniTuple(_PANEL_F4, 3)(_IN_2D, types.Array(types.int8, 2, 'A', readonly=True), _F8),
+    ]
+    SIG_ASSET_STATS = types.Tuple((_F8[::1, :], _OUT, _OUT, _OUT, _OUT))(
+        types.Array(types.float32, 2, 'A', readonly=True), _F8,
+    )
+    SIG_VOL_TARGET = types.void(types.float32[:, :], types.float32[:, :], _I8, _F8)
+except ImportError:
+    NUMBA_AVAILABLE = False
+    SIG_EWM_STEP = SIG_EMA = SIG_RSI = SIG_ATR = SIG_MACD = SIG_RSI_2D = SIG_ATR_2D = SIG_MACD_2D = SIG_SIGNALS = SIG_ROLLING_MEAN_COL = SIG_ROLLING_STD_COL = SIG_ROLLING_MEAN = SIG_ROLLING_STD = SIG_STRATEGY_RETURNS = SIG_ASSET_STATS = SIG_VOL_TARGET = None
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit."""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+# numba's workqueue threading layer must not be entered from two threads at
+# once, and Streamlit runs each session in its own thread. Hold this lock
+# around every call to a parallel kernel.
+PARALLEL_LOCK = threading.Lock()
+
+@njit(SIG_EWM_STEP, cache=True, boundscheck=False)
+def _ewm_step(avg, old_wt, cur, alpha):
+    """
+    One adjust=False EWM update, returning the new (avg, old_wt).
+
+    Matches pandas: the average stays NaN until the first valid value, NaNs
+    carry it forward, and the old average's weight decays across NaN gaps.
+    """
+    if cur == cur:
+        if avg != avg:
+            return cur, 1.0
+        old_wt *= 1.0 - alpha
+        return (old_wt * avg + alpha * cur) / (old_wt + alpha), 1.0
+    if avg == avg:
+        return avg, old_wt * (1.0 - alpha)
+    return avg, old_wt
+
+
+@njit(SIG_EMA, cache=True, boundscheck=False)
+def wilder_ema(x, alpha):
+    """Exponential moving average, same as pd.Series.ewm(alpha=alpha, adjust=False).mean()."""
+    n = x.shape[0]
+    out = np.empty(n)
+    avg = np.nan
+    old_wt = 1.0
+    for i in range(n):
+        avg, old_wt = _ewm_step(avg, old_wt, x[i], alpha)
+        out[i] = avg
+    return out
+
+
+@njit(SIG_RSI, cache=True, boundscheck=False)
+def rsi_kernel(close, window):
+    """
+    Relative Strength Index with Wilder smoothing.
+
+    The gain/loss split is fused into the smoothing recurrence, so no
+    intermediate gain, loss or average arrays are allocated.
+    """
+    n = close.shape[0]
+    out = np.empty(n)
+    alpha = 1.0 / window
+    # Row 0 has no delta and counts as a zero gain and loss, like delta.where(delta > 0, 0)
+    avg_gain = avg_loss = 0.0
+    gain_wt = loss_wt = 1.0
+    for i in range(n):
+        if i > 0:
+            delta = close[i] - close[i - 1]
+            # NaN deltas fail both comparisons and count as no move
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            avg_gain, gain_wt = _ewm_step(avg_gain, gain_wt, gain, alpha)
+            avg_loss, loss_wt = _ewm_step(avg_loss, loss_wt, loss, alpha)
+        rs = avg_gain / (avg_loss + 1e-10)
+        out[i] = 100.0 - 100.0 / (1.0 + rs)
+    return out
+
+
+@njit(SIG_ATR, cache=True, boundscheck=False)
+def atr_kernel(high, low, close, window):
+    """Average True Range with Wilder smoothing."""
+    n = close.shape[0]
+    true_range = np.empty(n)
+    for i in range(n):
+        tr = high[i] - low[i]
+        if i > 0:
+            # fmax skips NaN terms, like max(axis=1) over the three ranges
+            tr = np.fmax(tr, abs(high[i] - close[i - 1]))
+            tr = np.fmax(tr, abs(low[i] - close[i - 1]))
+        true_range[i] = tr
+    return wilder_ema(true_range, 1.0 / window)
+
+
+@njit(SIG_MACD, cache=True, boundscheck=False)
+def macd_fused(close, alpha_fast, alpha_slow, alpha_signal):
+    """
+    Fast/slow EMAs, MACD line, signal line and histogram in a single pass.
+
+    Keeps the three EWM recurrences side by side instead of running one
+    pandas ewm per series. Returns (ema_fast, ema_slow, macd, signal, histogram).
+    """
+    n = close.shape[0]
+    ema_fast = np.empty(n)
+    ema_slow = np.empty(n)
+    macd = np.empty(n)
+    signal = np.empty(n)
+    histogram = np.empty(n)
+
+    fast = slow = sig = np.nan
+    fast_wt = slow_wt = sig_wt = 1.0
+    for i in range(n):
+        fast, fast_wt = _ewm_step(fast, fast_wt, close[i], alpha_fast)
+        slow, slow_wt = _ewm_step(slow, slow_wt, close[i], alpha_slow)
+        line = fast - slow
+        sig, sig_wt = _ewm_step(sig, sig_wt, line, alpha_signal)
+
+        ema_fast[i] = fast
+        ema_slow[i] = slow
+        macd[i] = line
+        signal[i] = sig
+        histogram[i] = line - sig
+    return ema_fast, ema_slow, macd, signal, histogram
+
+
+# The *_2d kernels run a 1-D kernel on every column of a (dates x symbols)
+# panel, one symbol per thread. Outputs are column-major so each thread
+# writes one contiguous column.
+
+@njit(SIG_RSI_2D, parallel=True, cache=True, boundscheck=False)
+def rsi_2d(close, window):
+    """rsi_kernel on each column of a panel."""
+    n, k = close.shape
+    out = np.empty((k, n)).T
+    for j in prange(k):
+        out[:, j] = rsi_kernel(np.ascontiguousarray(close[:, j]), window)
+    return out
+
+
+@njit(SIG_ATR_2D, parallel=True, cache=True, boundscheck=False)
+def atr_2d(high, low, close, window):
+    """atr_kernel on each column of a panel."""
+    n, k = close.shape
+    out = np.empty((k, n)).T
+    for j in prange(k):
+        out[:, j] = atr_kernel(
+            np.ascontiguousarray(high[:, j]),
+            np.ascontiguousarray(low[:, j]),
+            np.ascontiguousarray(close[:, j]),
+            window,
+        )
+    return out
+
+
+@njit(SIG_MACD_2D, parallel=True, cache=True, boundscheck=False)
+def macd_2d(close, alpha_fast, alpha_slow, alpha_signal):
+    """macd_fused on each column of a panel; returns the same five series as 2-D arrays."""
+    n, k = close.shape
+    ema_fast = np.empty((k, n)).T
+    ema_slow = np.empty((k, n)).T
+    macd = np.empty((k, n)).T
+    signal = np.empty((k, n)).T
+    histogram = np.empty((k, n)).T
+    for j in prange(k):
+        columns = macd_fused(np.ascontiguousarray(close[:, j]), alpha_fast, alpha_slow, alpha_signal)
+        ema_fast[:, j] = columns[0]
+        ema_slow[:, j] = columns[1]
+        macd[:, j] = columns[2]
+        signal[:, j] = columns[3]
+        histogram[:, j] = columns[4]
+    return ema_fast, ema_slow, macd, signal, histogram
+
+
+@njit(SIG_SIGNALS, parallel=True, cache=True, boundscheck=False)
+def build_signals_nb(close, sma, rsi, macd_hist, weights, total_weight, oversold, overbought, threshold):
+    """
+    Combined momentum/RSI/MACD signal for a (dates x symbols) panel.
+
+    Same rules as MomentumSignal, RSISignal, MACDSignal and SignalCombiner:
+    each component is +1/0/-1 (NaN inputs give 0), the weighted sum is divided
+    by total_weight and thresholded at +/-threshold. weights holds the float32
+    (momentum, rsi, macd) weights, 0 for a component that is not used, and the
+    sum is accumulated in float32 like SignalCombiner. Symbols are processed in
+    parallel; the result is int8.
+    """
+    n, k = close.shape
+    out = np.empty((n, k), dtype=np.int8)
+    total = np.float32(total_weight)
+    one = np.float32(1.0)
+    zero = np.float32(0.0)
+    for j in prange(k):
+        for i in range(n):
+            diff = close[i, j] - sma[i, j]
+            momentum = one if diff > 0 else (-one if diff < 0 else zero)
+            value = rsi[i, j]
+            rsi_signal = one if value < oversold else (-one if value > overbought else zero)
+            hist = macd_hist[i, j]
+            macd = one if hist > 0 else (-one if hist < 0 else zero)
+
+            combined = (weights[0] * momentum + weights[1] * rsi_signal + weights[2] * macd) / total
+            out[i, j] = 1 if combined > threshold else (-1 if combined < -threshold else 0)
+    return out
+
+
+@njit(SIG_ROLLING_MEAN_COL, cache=True, boundscheck=False)
+def _rolling_mean_col(x, window, out):
+    """
+    Rolling mean of one column into out, same as bottleneck's
+    move_mean(min_count=window): NaN until the window is full or while it
+    holds a NaN.
+
+    Keeps a running sum, adding the incoming and subtracting the outgoing
+    value at each step, so the cost does not depend on the window length. A
+    window of identical values gives exactly that value, as in pandas, rather
+    than the sum's rounding error.
+    """
+    total = 0.0
+    nobs = 0
+    same_run = 0
+    prev = np.nan
+    for i in range(len(x)):
+        value = x[i]
+        if value == value:
+            same_run = same_run + 1 if value == prev else 1
+            prev = value
+            total += value
+            nobs += 1
+        if i >= window:
+            old = x[i - window]
+            if old == old:
+                total -= old
+                nobs -= 1
+
+        if nobs < window:
+            out[i] = np.nan
+        elif same_run >= nobs:
+            out[i] = prev
+        else:
+            out[i] = total / nobs
+
+
+@njit(SIG_ROLLING_STD_COL, cache=True, boundscheck=False, error_model='numpy')
+def _rolling_std_col(x, window, ddof, out):
+    """
+    Rolling standard deviation of one column into out, same as
+    Series.rolling(window).std(ddof).
+
+    Keeps a running mean and sum of squared deviations and adds the incoming /
+    removes the outgoing value at each step (Welford, with the same
+    compensation pandas uses), so the cost does not depend on the window
+    length. A window holding any NaN gives NaN, and a window of identical
+    values gives exactly 0, as in pandas.
+
+    Once the window is full, a step that swaps one valid value for another
+    updates mean and sum of squares in one go with a precomputed 1 / window,
+    as bottleneck's move_std does; this avoids two dependent divisions per
+    row, which dominate the kernel's run time.
+    """
+    nobs = 0
+    mean = 0.0
+    ssqdm = 0.0
+    comp = 0.0
+    same_run = 0
+    prev = np.nan
+    inv_window = 1.0 / window
+    for i in range(len(x)):
+        value = x[i]
+        old = x[i - window] if i >= window else np.nan
+        if nobs == window and old == old and value == value:
+            same_run = same_run + 1 if value == prev else 1
+            prev = value
+            delta = value - old
+            prev_mean = mean
+            mean += delta * inv_window
+            ssqdm += delta * (value - mean + old - prev_mean)
+        else:
+            # Drop the value leaving the window before adding the new one, as pandas does
+            if old == old:
+                nobs -= 1
+                if nobs > 0:
+                    prev_mean = mean - comp
+                    y = old - comp
+                    t = y - mean
+                    comp = t + mean - y
+                    mean -= t / nobs
+                    ssqdm -= (old - prev_mean) * (old - mean)
+                else:
+                    mean = 0.0
+                    ssqdm = 0.0
+
+            if value == value:
+                same_run = same_run + 1 if value == prev else 1
+                prev = value
+                nobs += 1
+                prev_mean = mean - comp
+                y = value - comp
+                t = y - mean
+                comp = t + mean - y
+                mean += t / nobs
+                ssqdm += (value - prev_mean) * (value - mean)
+
+        if nobs < window or nobs <= ddof:
+            out[i] = np.nan
+        elif nobs == 1 or same_run >= nobs:
+            out[i] = 0.0
+        else:
+            out[i] = np.sqrt(max(ssqdm, 0.0) / (nobs - ddof))
+
+
+@njit(SIG_ROLLING_MEAN, parallel=True, cache=True, boundscheck=False)
+def rolling_mean_2d(x, window):
+    """Column-wise rolling mean of a (dates x symbols) panel; see _rolling_mean_col."""
+    n, k = x.shape
+    out = np.empty((k, n)).T
+    for j in prange(k):
+        _rolling_mean_col(x[:, j], window, out[:, j])
+    return out
+
+
+@njit(SIG_ROLLING_STD, parallel=True, cache=True, boundscheck=False)
+def rolling_std_2d(x, window, ddof):
+    """Column-wise rolling standard deviation of a (dates x symbols) panel; see _rolling_std_col."""
+    n, k = x.shape
+    out = np.empty((k, n)).T
+    for j in prange(k):
+        _rolling_std_col(x[:, j], window, ddof, out[:, j])
+    return out
+
+
+@njit(SIG_STRATEGY_RETURNS, parallel=True, cache=True, boundscheck=False, error_model='numpy')
+def strategy_returns_kernel(prices, signals, cost_rate):
+    """
+    Positions, strategy returns and absolute position changes for a
+    (dates x symbols) panel in one pass per symbol.
+
+    signals may be float32 or int8 (widened to float32 per element).
+    positions[t] = signals[t - 1], the price return at t is pct_change with
+    NaN as 0 (ratio in float64), and the strategy return is
+    positions * return - cost_rate * change, NaN on the first row. Outputs
+    are float32 and column-major, computed with the same float32 operations
+    as the NumPy version in trading.backtest.
+    """
+    n, k = prices.shape
+    positions = np.empty((k, n), dtype=np.float32).T
+    strategy_returns = np.empty((k, n), dtype=np.float32).T
+    changes = np.empty((k, n), dtype=np.float32).T
+    cost = np.float32(cost_rate)
+    for j in prange(k):
+        prev_position = np.float32(0.0)
+        positions[0, j] = prev_position
+        strategy_returns[0, j] = np.nan
+        changes[0, j] = 0.0
+        for i in range(1, n):
+            position = np.float32(signals[i - 1, j])
+            ret = np.float32(prices[i, j] / prices[i - 1, j] - 1.0)
+            if ret != ret:
+                ret = np.float32(0.0)
+            change = abs(position - prev_position)
+            positions[i, j] = position
+            changes[i, j] = change
+            strategy_returns[i, j] = position * ret - change * cost
+            prev_position = position
+    return positions, strategy_returns, changes
+
+
+@njit(SIG_VOL_TARGET, parallel=True, cache=True, boundscheck=False, error_model='numpy')
+def vol_target_scale(positions, strategy_returns, window, target):
+    """
+    Scale positions and strategy returns in place by clip(target / vol, 0, 2),
+    where vol is the annualized rolling(window) std of the unscaled returns.
+
+    A NaN scale (no vol estimate yet) counts as 1, like the pandas version.
+    Each thread works on one column: its rolling vol goes into a per-column
+    buffer, so no (dates x symbols) vol panel is allocated. error_model='numpy'
+    keeps numpy's inf result for zero vol.
+    """
+    n, k = positions.shape
+    annualize = np.sqrt(252.0)
+    for j in prange(k):
+        vol = np.empty(n)
+        _rolling_std_col(strategy_returns[:, j], window, 1, vol)
+        for i in range(n):
+            scale = target / (vol[i] * annualize)
+            if scale != scale:
+                scale = 1.0
+            else:
+                scale = min(max(scale, 0.0), 2.0)
+            strategy_returns[i, j] = strategy_returns[i, j] * scale
+            positions[i, j] = positions[i, j] * scale
+
+
+@njit(SIG_ASSET_STATS, parallel=True, cache=True, boundscheck=False, error_model='numpy')
+def asset_stats_2d(strategy_returns, capital):
+    """
+    Per-asset equity curves and summary statistics for a (dates x symbols)
+    panel of strategy returns, in one parallel pass per symbol.
+
+    Returns the equity panel (capital * cumulative product of 1 + return,
+    NaN returns skipped and kept as NaN) and per column the mean and sample
+    standard deviation of the non-NaN returns, the maximum drawdown of the
+    equity curve from its running peak, and the win rate (returns > 0 over
+    returns != 0, NaN counting as nonzero like the NumPy version). Empty
+    columns give NaN. Sums are taken in float64.
+    """
+    n, k = strategy_returns.shape
+    equity = np.empty((k, n)).T
+    mean = np.empty(k)
+    std = np.empty(k)
+    max_drawdown = np.empty(k)
+    win_rate = np.empty(k)
+    for j in prange(k):
+        growth = 1.0
+        total = 0.0
+        count = 0
+        wins = 0
+        nonzero = 0
+        peak = np.nan
+        worst = np.nan
+        for i in range(n):
+            ret = strategy_returns[i, j]
+            if ret > 0:
+                wins += 1
+            if ret != 0:
+                nonzero += 1
+            if ret != ret:
+                equity[i, j] = np.nan
+                continue
+            total += ret
+            count += 1
+            growth *= 1.0 + ret
+            value = growth * capital
+            equity[i, j] = value
+            if not value <= peak:
+                peak = value
+            drawdown = (value - peak) / peak
+            if drawdown == drawdown and not drawdown >= worst:
+                worst = drawdown
+        col_mean = total / count
+        squares = 0.0
+        for i in range(n):
+            ret = strategy_returns[i, j]
+            if ret == ret:
+                squares += (ret - col_mean) ** 2
+        mean[j] = col_mean
+        std[j] = np.sqrt(squares / (count - 1))
+        max_drawdown[j] = worst
+        win_rate[j] = wins / nonzero
+    return equity, mean, std, max_drawdown, win_rate
@@ -13,6 +13,107 @@ import pandas as pd
 import numpy as np
 from typing import Optional 
 
+from numpy.lib.stride_tricks import sliding_window_view
+
+try:
+    import bottleneck as bn
+    BOTTLENECK_AVAILABLE = True
+except ImportError:
+    BOTTLENECK_AVAILABLE = False
+
+try:
+    import numexpr as ne
+    NUMEXPR_AVAILABLE = True
+except ImportError:
+    NUMEXPR_AVAILABLE = False
+
+from src.analytics._kernels import (
+    NUMBA_AVAILABLE,
+    PARALLEL_LOCK,
+    atr_2d,
+    atr_kernel,
+    macd_2d,
+    macd_fused,
+    rolling_mean_2d,
+    rolling_std_2d,
+    rsi_2d,
+    rsi_kernel,
+)
+
+# Bump when feature definitions change so cached features/signals are recomputed
+FEATURES_VERSION = 1
+
+# Helpers below take 1-D arrays (one symbol) or 2-D (dates x symbols) arrays
+# and work along axis 0, so the same code serves compute_all and compute_all_multi.
+
+def _columnwise(kernel, panel_kernel, arrays: tuple, *args):
+    """
+    Run a 1-D kernel on 1-D arrays, or its *_2d panel kernel on same-shaped
+    2-D arrays, which processes the symbols in parallel.
+
+    Kernels returning a tuple of arrays get a tuple of 2-D arrays back.
+    """
+    if arrays[0].ndim == 1:
+        return kernel(*(np.ascontiguousarray(a) for a in arrays), *args)
+    with PARALLEL_LOCK:
+        return panel_kernel(*arrays, *args)
+
+def _shift(x: np.ndarray, periods: int) -> np.ndarray:
+    """Like Series.shift(periods) for periods > 0: NaN-padded at the start."""
+    out = np.full(x.shape, np.nan)
+    out[periods:] = x[:-periods]
+    return out
+
+def _pct_change(x: np.ndarray, periods: int) -> np.ndarray:
+    """Like Series.pct_change(periods)."""
+    return x / _shift(x, periods) - 1
+
+def _rolling(x: np.ndarray, window: int, reduce) -> np.ndarray:
+    """
+    Full-window rolling reduction; NaN until the window is full or if it holds a NaN.
+
+    Fallback for when neither numba nor bottleneck (compiled moving-window
+    functions) is installed.
+    """
+    out = np.full(x.shape, np.nan)
+    if len(x) >= window:
+        out[window - 1:] = reduce(sliding_window_view(x, window, axis=0), axis=-1)
+    return out
+
+def _rolling_panel(kernel, x: np.ndarray, *args) -> np.ndarray:
+    """Run a parallel 2-D rolling kernel on a 1-D or 2-D array."""
+    panel = x if x.ndim == 2 else x[:, None]
+    with PARALLEL_LOCK:
+        out = kernel(panel, *args)
+    return out if x.ndim == 2 else out[:, 0]
+
+def _rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """Like rolling(window).mean()."""
+    if NUMBA_AVAILABLE:
+        return _rolling_panel(rolling_mean_2d, x, window)
+    # bottleneck rejects windows longer than the series; _rolling gives all-NaN
+    if BOTTLENECK_AVAILABLE and len(x) >= window:
+        return bn.move_mean(x, window=window, min_count=window, axis=0)
+    return _rolling(x, window, np.mean)
+
+def _rolling_std(x: np.ndarray, window: int) -> np.ndarray:
+    """Like rolling(window).std(ddof=0)."""
+    if NUMBA_AVAILABLE:
+        return _rolling_panel(rolling_std_2d, x, window, 0)
+    if BOTTLENECK_AVAILABLE and len(x) >= window:
+        return bn.move_std(x, window=window, min_count=window, axis=0, ddof=0)
+    return _rolling(x, window, np.std)
+
+def _band_position(close: np.ndarray, sma: np.ndarray, std: np.ndarray) -> np.ndarray:
+    """
+    Position of close within +/-2 std bands around sma: (close - lower) / (upper - lower).
+
+    The band width upper - lower is 4 * std, so this is one fused expression.
+    """
+    if NUMEXPR_AVAILABLE:
+        return ne.evaluate('(c - s + 2 * sd) / (4 * sd)', local_dict={'c': close, 's': sma, 'sd': std})
+    return (close - sma + 2 * std) / (4 * std)
+
 class FeatureEngine:
     """
     Generate features from price data.
@@ -20,6 +121,9 @@ class FeatureEngine:
     Example:
         engine = FeatureEngine()
         features = engine.compute_all(price_df)
+
+        # many symbols at once (columns = symbols)
+        multi = engine.compute_all_multi(close_df)
     """
 
     def compute_all(
@@ -38,138 +142,194 @@ class FeatureEngine:
             DataFrame with original data plus feature columns
         """
 
-        result = df.copy()
-
         # Ensure we have the close column
-        if 'close' not in result.columns:
+        if 'close' not in df.columns:
             raise ValueError("DataFrame must contain 'close' column")
 
-        result = self._add_returns(result)
+        close = df['close']
+        features = self._compute_features(
+            close.to_numpy(dtype=np.float64),
+            high=df.get('high', close).to_numpy(dtype=np.float64),
+            low=df.get('low', close).to_numpy(dtype=np.float64),
+            include_ta=include_ta,
+        )
+
+        # Assemble the feature frame once and attach it to a copy of the input
+        feature_df = pd.DataFrame(features, index=df.index)
+        return pd.concat([df.drop(columns=feature_df.columns, errors='ignore'), feature_df], axis=1)
+
+    def compute_all_multi(
+        self,
+        prices_df: pd.DataFrame,
+        include_ta: bool = True,
+    ) -> pd.DataFrame:
+        """
+        Compute all features for many symbols in one vectorized pass.
+
+        Every rolling/ewm call runs once on the wide frame instead of once per
+        symbol, so indicator dispatch cost no longer scales with the number of
+        symbols. High/low fall back to close, as in compute_all.
+
+        Args:
+            prices_df: DataFrame of close prices (columns = symbols, index = dates)
+            include_ta: Include technical analysis indicators
+
+        Returns:
+            DataFrame with (feature, symbol) MultiIndex columns, including 'close'.
+            Use features.xs(symbol, axis=1, level=1) for one symbol's features.
+        """
+        close = prices_df.to_numpy(dtype=np.float64)
+        features = self._compute_features(close, high=close, low=close, include_ta=include_ta)
+
+        return pd.concat(
+            {
+                name: pd.DataFrame(values, index=prices_df.index, columns=prices_df.columns)
+                for name, values in {'close': close, **features}.items()
+            },
+            axis=1,
+        )
+
+    def _compute_features(
+        self,
+        close: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        include_ta: bool = True,
+    ) -> dict:
+        """
+        Compute feature arrays from close/high/low.
+
+        Inputs are float64 arrays, 1-D for one symbol or 2-D (dates x symbols);
+        every feature is computed along axis 0 and returned under its column name.
+        """
+        features = {}
 
-        result = self._add_volatility(result)
+        # NaN/inf from flat prices or gaps are expected, as they were with pandas
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self._add_returns(features, close)
 
-        result = self._add_moving_averages(result)
+            self._add_volatility(features)
 
-        if include_ta:
-            result = self._add_technical_indicators(result)
+            macd = self._calculate_macd(close)
 
-        return result
+            self._add_moving_averages(features, close, macd)
 
-    def _add_returns(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Add return calculations."""
-        close = df['close']
+            if include_ta:
+                self._add_technical_indicators(features, close, high, low, macd)
+
+        return features
 
-        df['return_1d'] = close.pct_change(1)
-        df['return_5d'] = close.pct_change(5)
-        df['return_21d'] = close.pct_change(21)
+    def _add_returns(self, features: dict, close: np.ndarray) -> dict:
+        """Add return calculations."""
+        features['return_1d'] = _pct_change(close, 1)
+        features['return_5d'] = _pct_change(close, 5)
+        features['return_21d'] = _pct_change(close, 21)
 
-        df['log_return_1d'] = np.log(close / close.shift(1))
+        features['log_return_1d'] = np.log(close / _shift(close, 1))
 
-        df['cumulative_return'] = (1 + df['return_1d'].fillna(0)).cumprod() - 1
+        features['cumulative_return'] = np.cumprod(1 + np.nan_to_num(features['return_1d'], nan=0.0), axis=0) - 1
 
-        return df 
+        return features
 
-    def _add_volatility(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _add_volatility(self, features: dict) -> dict:
         """Add volatility calculations."""
-        returns = df['log_return_1d']
+        returns = features['log_return_1d']
 
         #Rolling volatility annualized
-        df['volatility_21d'] = returns.rolling(21).std(ddof=0) * np.sqrt(252)
-        df['volatility_63d'] = returns.rolling(63).std(ddof=0) * np.sqrt(252)
+        features['volatility_21d'] = _rolling_std(returns, 21) * np.sqrt(252)
+        features['volatility_63d'] = _rolling_std(returns, 63) * np.sqrt(252)
 
-        df['realized_vol_5d'] = returns.rolling(5).std(ddof=0) * np.sqrt(252)
+        features['realized_vol_5d'] = _rolling_std(returns, 5) * np.sqrt(252)
 
-        return df
+        return features
 
-    def _add_moving_averages(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _add_moving_averages(self, features: dict, close: np.ndarray, macd: dict) -> dict:
         """Add moving average calculations."""
-        close = df['close']
-
         # Simple Moving Averages
-        df['sma_10'] = close.rolling(10).mean()
-        df['sma_21'] = close.rolling(21).mean()
-        df['sma_50'] = close.rolling(50).mean()
-        df['sma_200'] = close.rolling(200).mean()
+        features['sma_10'] = _rolling_mean(close, 10)
+        features['sma_21'] = _rolling_mean(close, 21)
+        features['sma_50'] = _rolling_mean(close, 50)
+        features['sma_200'] = _rolling_mean(close, 200)
 
-        # Exponential Moving Averages
-        df['ema_12'] = close.ewm(span=12, adjust=False).mean()
-        df['ema_26'] = close.ewm(span=26, adjust=False).mean()
+        # Exponential Moving Averages (from the fused MACD pass)
+        features['ema_12'] = macd['ema_12']
+        features['ema_26'] = macd['ema_26']
 
         # price relative to moving averages
-        df['price_to_sma_21'] = close / df['sma_21'] - 1
-        df['price_to_sma_50'] = close / df['sma_50'] - 1
-        df['price_to_sma_200'] = close / df['sma_200'] - 1
+        features['price_to_sma_21'] = close / features['sma_21'] - 1
+        features['price_to_sma_50'] = close / features['sma_50'] - 1
+        features['price_to_sma_200'] = close / features['sma_200'] - 1
 
         # Moving average crossovers 
-        df['sma_10_above_50'] = (df['sma_10'] > df['sma_50']).astype(int)
-        df['sma_50_above_200'] = (df['sma_50'] > df['sma_200']).astype(int)
+        features['sma_10_above_50'] = (features['sma_10'] > features['sma_50']).astype(int)
+        features['sma_50_above_200'] = (features['sma_50'] > features['sma_200']).astype(int)
 
-        return df
+        return features
 
-    def _add_technical_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _add_technical_indicators(
+        self,
+        features: dict,
+        close: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        macd: dict,
+    ) -> dict:
         """Add technical analysis indicators."""
-        close = df['close']
-        high = df.get('high', close)
-        low = df.get('low', close)
-
-        df['rsi_14'] = self._calculate_rsi(close, 14)
+        features['rsi_14'] = self._calculate_rsi(close, 14)
 
         # MACD
-        macd_line = df['ema_12'] - df['ema_26']
-        signal_line = macd_line.ewm(span=9, adjust=False).mean()
-        df['macd'] = macd_line
-        df['macd_signal'] = signal_line
-        df['macd_histogram'] = macd_line - signal_line
+        features['macd'] = macd['macd']
+        features['macd_signal'] = macd['macd_signal']
+        features['macd_histogram'] = macd['macd_histogram']
 
         # Bollinger Bands
-        sma_20 = close.rolling(20).mean()
-        std_20 = close.rolling(20).std(ddof=0)
-        df['bb_upper'] = sma_20 + (2 * std_20)
-        df['bb_lower'] = sma_20 - (2 * std_20)
-        df['bb_position'] = (close - df['bb_lower']) / (df['bb_upper'] - df['bb_lower']) #where current price is in relation to the bands
+        sma_20 = _rolling_mean(close, 20)
+        std_20 = _rolling_std(close, 20)
+        features['bb_upper'] = sma_20 + (2 * std_20)
+        features['bb_lower'] = sma_20 - (2 * std_20)
+        features['bb_position'] = _band_position(close, sma_20, std_20) #where current price is in relation to the bands
 
         # Average True Range (ATR)
-        df['atr_14'] = self._calculate_atr(high, low, close, 14)
+        features['atr_14'] = self._calculate_atr(high, low, close, 14)
 
         # Momentum 
-        df['momentum_10'] = close / close.shift(10) - 1
-        df['momentum_21'] = close / close.shift(21) - 1
+        features['momentum_10'] = _pct_change(close, 10)
+        features['momentum_21'] = _pct_change(close, 21)
 
-        return df
+        return features
 
-    def _calculate_rsi(self, prices: pd.Series, window: int = 14) -> pd.Series:
+    def _calculate_macd(
+        self,
+        close: np.ndarray,
+        fast: int = 12,
+        slow: int = 26,
+        signal: int = 9,
+    ) -> dict:
+        """Calculate EMA fast/slow, MACD line, signal and histogram in one fused pass."""
+        outputs = _columnwise(
+            macd_fused,
+            macd_2d,
+            (close,),
+            2.0 / (fast + 1),
+            2.0 / (slow + 1),
+            2.0 / (signal + 1),
+        )
+        names = [f'ema_{fast}', f'ema_{slow}', 'macd', 'macd_signal', 'macd_histogram']
+        return dict(zip(names, outputs))
+
+    def _calculate_rsi(self, prices: np.ndarray, window: int = 14) -> np.ndarray:
         """Calculate Relative Strength Index."""
-        delta = prices.diff()
-
-        gain = delta.where(delta > 0, 0)
-        loss = (-delta).where(delta < 0, 0)
-
-        avg_gain = gain.ewm(alpha=1/window, adjust=False).mean()
-        avg_loss = loss.ewm(alpha=1/window, adjust=False).mean()
-
-        rs = avg_gain / (avg_loss + 1e-10)
-        rsi = 100 - (100 / (1 + rs))
-
-        return rsi 
+        return _columnwise(rsi_kernel, rsi_2d, (prices,), window)
 
     def _calculate_atr(
         self,
-        high: pd.Series,
-        low: pd.Series, 
-        close: pd.Series, 
+        high: np.ndarray,
+        low: np.ndarray, 
+        close: np.ndarray, 
         window: int = 14
-    ) -> pd.Series:
+    ) -> np.ndarray:
         """Calculate Average True Range."""
-        prev_close = close.shift(1)
-
-        tr1 = high - low
-        tr2 = (high - prev_close).abs()
-        tr3 = (low - prev_close).abs()
-
-        true_range = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        atr = true_range.ewm(alpha=1/window, adjust=False).mean()
-
-        return atr 
+        return _columnwise(atr_kernel, atr_2d, (high, low, close), window)
 
     def get_feature_names(self) -> list:
         """Get list of feature names that will be generated."""
@@ -9,6 +9,16 @@ import numpy as np
 from abc import ABC, abstractmethod
 from typing import Dict, Optional
 
+from src.analytics.features import _rolling_mean
+
+_LONG, _FLAT, _SHORT = np.int8(1), np.int8(0), np.int8(-1)
+
+def _sign_int8(x: np.ndarray) -> np.ndarray:
+    """+1 where x > 0, -1 where x < 0, 0 otherwise (including NaN), as int8."""
+    # The two masks never overlap, so their difference is the sign; viewing
+    # the bool masks as int8 avoids an int64 temporary and a final astype copy
+    return (x > 0).view(np.int8) - (x < 0).view(np.int8)
+
 class SignalBase(ABC):
     """Abstract base class for signal generators."""
 
@@ -36,23 +46,23 @@ class MomentumSignal(SignalBase):
 
     def __init__(self, window: int = 21):
         self.window = window
+        self.sma_col = f'sma_{window}'
 
     @property 
     def name(self) -> str:
         return f"Momentum_{self.window}"
 
     def generate(self, df: pd.DataFrame) -> pd.Series:
-        """Generate signals based on price relative to SMA."""
-        if 'sma_21' not in df.columns or 'close' not in df.columns:
-            raise ValueError("DataFrame must contain 'sma_21' and 'close' columns")
-
-        sma_col = f'sma_{self.window}' if 'sma_{self.window}' in df.columns else 'sma_21'
-        sma = df[sma_col]
-        close = df['close']
-        signal = np.sign(close - sma)
-        signal = signal.replace(0, np.nan).fillna(0).astype(int)
+        """Generate signals based on price relative to the SMA of this signal's window."""
+        if self.sma_col not in df.columns or 'close' not in df.columns:
+            raise ValueError(
+                f"DataFrame must contain '{self.sma_col}' and 'close' columns; "
+                "FeatureEngine computes sma_10, sma_21, sma_50 and sma_200"
+            )
 
-        return signal
+        sma = df[self.sma_col].to_numpy()
+        close = df['close'].to_numpy()
+        return pd.Series(_sign_int8(close - sma), index=df.index)
 
 class RSISignal(SignalBase):
     """Long when oversold (RSI < 30), short when overbought (RSI > 70)"""
@@ -69,14 +79,12 @@ class RSISignal(SignalBase):
         if 'rsi_14' not in df.columns:
             raise ValueError("DataFrame must contain 'rsi_14'. Run FeatureEngine with include_ta = True first.")
 
-        rsi = df['rsi_14']
+        rsi = df['rsi_14'].to_numpy()
 
         # +1 oversold (buy), -1 overbought (sell), 0 neutral
-        signal = pd.Series(0, index=df.index)
-        signal[rsi < self.oversold] = 1
-        signal[rsi > self.overbought] = -1
+        signal = np.where(rsi < self.oversold, _LONG, np.where(rsi > self.overbought, _SHORT, _FLAT))
 
-        return signal
+        return pd.Series(signal, index=df.index)
 
 class MACDSignal(SignalBase):
     """Long when MACD histogram > 0 short when < 0"""
@@ -89,11 +97,8 @@ class MACDSignal(SignalBase):
         if 'macd_histogram' not in df.columns:
             raise ValueError("DataFrame must contain 'macd_histogram'. Run FeatureEngine with include_ta = True first.")
 
-        hist = df['macd_histogram']
-        signal = np.sign(hist)
-        signal = signal.replace(0, np.nan).fillna(0).astype(int)
-
-        return signal
+        hist = df['macd_histogram'].to_numpy()
+        return pd.Series(_sign_int8(hist), index=df.index)
 
 class SignalCombiner:
     """Combine multiple signals into a single signal with optional weights."""
@@ -107,28 +112,37 @@ class SignalCombiner:
         self.signals = signals 
         self.weights = weights or {name: 1.0 for name in signals}
 
+        # Fixed per combiner, so computed once rather than on every generate()
+        self.weights_arr = np.array([self.weights.get(n, 1.0) for n in signals], dtype=np.float32)
+        self.total_weight = sum(self.weights.get(n, 1.0) for n in self.signals)
+        self.thresholds = np.array([-0.33, 0.33])
+
     def generate(self, df: pd.DataFrame) -> pd.Series:
         """Generate combined signal from feature DataFrame."""
-        results = {}
-
-        for name, signal_gen in self.signals.items():
-            sig = signal_gen.generate(df)
-            weight = self.weights.get(name, 1.0)
-            results[name] = sig * weight
-
-        combined = pd.DataFrame(results).sum(axis=1)
-        total_weight = sum(self.weights.get(n, 1.0) for n in self.signals)
-        combined = combined / total_weight
+        # Accumulate in place, one signal at a time, without stacking them
+        combined = np.zeros(len(df), dtype=np.float32)
+        for signal_gen, weight in zip(self.signals.values(), self.weights_arr):
+            combined += signal_gen.generate(df).to_numpy(dtype=np.float32) * weight
+        combined /= self.total_weight
 
-        discrete = pd.Series(0, index=df.index)
-        discrete[combined > 0.33] = 1
-        discrete[combined < -0.33] = -1
+        lower, upper = self.thresholds
+        discrete = np.where(combined > upper, _LONG, np.where(combined < lower, _SHORT, _FLAT))
 
-        return discrete
+        return pd.Series(discrete, index=df.index)
 
 def momentum_signal(df: pd.DataFrame, window: int = 21) -> pd.Series:
-    """Convenience function for MomentumSignal."""
-    return MomentumSignal(window).generate(df)
+    """
+    Convenience function for MomentumSignal.
+
+    df only needs 'close': if it has no sma_{window} column (any window
+    FeatureEngine does not compute, or raw prices), the SMA is computed here
+    with the NumPy rolling mean FeatureEngine uses.
+    """
+    signal = MomentumSignal(window)
+    if signal.sma_col not in df.columns and 'close' in df.columns:
+        close = df['close'].to_numpy(dtype=np.float64)
+        df = pd.DataFrame({'close': close, signal.sma_col: _rolling_mean(close, window)}, index=df.index)
+    return signal.generate(df)
 
 def rsi_signal(df: pd.DataFrame, oversold: float = 30, overbought: float = 70) -> pd.Series:
     """Convenience function for RSISignal."""
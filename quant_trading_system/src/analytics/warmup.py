@@ -0,0 +1,68 @@
+"""
+Warm up the compiled feature kernels at application start.
+
+The kernels in src.analytics._kernels are compiled (or loaded from numba's
+on-disk cache) when that module is imported. Running each one once here, right
+after init_database(), keeps that cost off the first Backtest page render.
+"""
+
+import logging
+
+import numpy as np
+
+from src.analytics import _kernels
+
+logger = logging.getLogger(__name__)
+
+KERNELS = (
+    _kernels.wilder_ema,
+    _kernels.rsi_kernel,
+    _kernels.atr_kernel,
+    _kernels.macd_fused,
+    _kernels.rsi_2d,
+    _kernels.atr_2d,
+    _kernels.macd_2d,
+    _kernels.build_signals_nb,
+    _kernels.rolling_mean_2d,
+    _kernels.rolling_std_2d,
+    _kernels.strategy_returns_kernel,
+    _kernels.vol_target_scale,
+    _kernels.asset_stats_2d,
+)
+
+
+def warmup_kernels() -> bool:
+    """
+    Call every kernel once on a length-2 dummy array.
+
+    Returns:
+        True if numba had to compile any kernel because its cache was cold
+    """
+    x = np.array([1.0, 2.0])
+    _kernels.wilder_ema(x, 0.5)
+    _kernels.rsi_kernel(x, 14)
+    _kernels.atr_kernel(x, x, x, 14)
+    _kernels.macd_fused(x, 0.5, 0.5, 0.5)
+    panel = x.reshape(2, 1)
+    ones = np.ones((2, 1), dtype=np.float32)
+    # The panel kernels are parallel; hold the lock like every other caller
+    with _kernels.PARALLEL_LOCK:
+        _kernels.rsi_2d(panel, 14)
+        _kernels.atr_2d(panel, panel, panel, 14)
+        _kernels.macd_2d(panel, 0.5, 0.5, 0.5)
+        _kernels.rolling_mean_2d(panel, 2)
+        _kernels.rolling_std_2d(panel, 2, 0)
+        _kernels.build_signals_nb(panel, panel, panel, panel, np.ones(3, dtype=np.float32), 3.0, 30.0, 70.0, 0.33)
+        _kernels.strategy_returns_kernel(panel, ones, 0.002)
+        _kernels.strategy_returns_kernel(panel, ones.astype(np.int8), 0.002)
+        _kernels.vol_target_scale(ones.copy(), ones.copy(), 2, 0.1)
+        _kernels.asset_stats_2d(ones, 1.0)
+
+    if not _kernels.NUMBA_AVAILABLE:
+        logger.info("numba not installed; feature kernels run as plain Python")
+        return False
+
+    cold = [kernel.py_func.__name__ for kernel in KERNELS if kernel.stats.cache_misses]
+    if cold:
+        logger.info("numba cache was cold, compiled: %s", ", ".join(cold))
+    return bool(cold)
@@ -7,15 +7,50 @@ This module orchestrates:
 3. Load - Insert into database
 """
 
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date, datetime
-from typing import Optional 
-import pandas as pd 
+from typing import Optional
+import pandas as pd
+from sqlalchemy import bindparam, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from src.data.database import get_session, init_database
-from src.data.models import Instrument, PriceDaily, DataLoadLog, DataLoadSymbol, AssetClass
+from src.data.models import Instrument, PriceDaily, DataLoadLog, DataLoadSymbol, AssetClass, IngestionWatermark
 from src.data.sources.yfinance_source import YFinanceSource
 from src.data.sources.base import DataSource_error
 
+logger = logging.getLogger(__name__)
+
+PRICE_COLUMNS = ['date', 'open', 'high', 'low', 'close', 'volume', 'adj_close']
+INSERT_BATCH_SIZE = 5000
+# Symbols are fetched and loaded concurrently; fetching is network bound
+MAX_WORKERS = 8
+
+# Per-symbol lookups, built once with bind parameters and executed with each
+# symbol's values, so a run does not rebuild and re-key them per symbol
+_INSTRUMENT_ID_STMT = select(Instrument.id).where(Instrument.symbol == bindparam('symbol'))
+_EXISTING_DATES_STMT = select(PriceDaily.date).where(
+    PriceDaily.instrument_id == bindparam('instrument_id'),
+    PriceDaily.date.between(bindparam('start_date'), bindparam('end_date')),
+)
+
+def _fetch_start(watermark: Optional[IngestionWatermark], start_date: date, end_date: date) -> Optional[date]:
+    """
+    First date to request from the source for start_date..end_date, given
+    what is already loaded; None when the range is fully loaded.
+
+    When start_date falls inside the loaded range, the last loaded day is
+    fetched again so the window is never empty (the duplicate row is dropped
+    before insert).
+    """
+    if watermark and watermark.first_loaded_date <= start_date <= watermark.last_loaded_date:
+        if watermark.last_loaded_date >= end_date:
+            return None
+        return watermark.last_loaded_date
+    return start_date
+
 class ETLPipeline:
     """
     Market data ETL pipeline.
@@ -33,6 +68,10 @@ class ETLPipeline:
             source: DataSource instance (defaults to YFinanceSource)4
         """
         self.source = source or YFinanceSource()
+        self._instrument_cache: dict[str, int] = {}
+        # Source metadata per symbol; unlike the id cache this survives a
+        # rolled back load, so retrying the instrument does not refetch it
+        self._instrument_info: dict[str, dict] = {}
 
     def run(
         self,
@@ -56,6 +95,15 @@ class ETLPipeline:
         # Ensure database is initialized
         init_database()
 
+        # A repeated symbol would have two workers inserting the same instrument
+        symbols = list(dict.fromkeys(symbols))
+
+        # Resolve all known instrument ids in one query
+        self._load_instrument_ids(symbols)
+
+        # Batch the downloads up front when the source supports it
+        prefetched = self._prefetch_prices(symbols, start_date, end_date, skip_existing)
+
         # Start logging 
         job_log = self._start_job_log(symbols, start_date, end_date)
 
@@ -71,29 +119,39 @@ class ETLPipeline:
         }
 
         try:
-            for symbol in symbols:
-                print(f"\nProcessing {symbol}...")
-
+            # Each worker loads a symbol in its own session, so sessions are
+            # never shared between threads.
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+                futures = {
+                    executor.submit(
+                        self._load_symbol, job_log.id, symbol, start_date, end_date, skip_existing, prefetched
+                    ): symbol
+                    for symbol in symbols
+                }
                 try:
-                    # Extract and Transform
-                    result = self._process_symbol(symbol, start_date, end_date, skip_existing)
-
-                    stats['records_inserted'] += result['inserted']
-                    stats['records_skipped'] += result['skipped']
-                    stats['symbols_processed'] += 1
-
-                    # Log symbol success
-                    self._log_symbol(job_log.id, symbol, 'SUCCESS', result['inserted'], result['skipped'])
-
-                except DataSource_error as e:
-                    print(f"  ✗ Failed: {symbol}: {e}")
-                    stats['symbols_failed'] += 1
-                    self._log_symbol(job_log.id, symbol, 'FAILED', 0, 0, str(e)) 
+                    for future in as_completed(futures):
+                        symbol = futures[future]
+                        try:
+                            result = future.result()
+
+                            stats['records_inserted'] += result['inserted']
+                            stats['records_skipped'] += result['skipped']
+                            stats['symbols_processed'] += 1
+
+                        except DataSource_error as e:
+                            logger.warning("✗ Failed: %s: %s", symbol, e)
+                            stats['symbols_failed'] += 1
+                            with get_session() as session:
+                                self._log_symbol(session, job_log.id, symbol, 'FAILED', 0, 0, str(e))
+                except BaseException:
+                    for future in futures:
+                        future.cancel()
+                    raise
 
             self._complete_job_log(job_log.id, 'SUCCESS', stats['records_inserted'], stats['records_skipped'])
 
         except Exception as e:
-            print(f"Unexpected error processing all symbols: {e}")
+            logger.error("Unexpected error processing all symbols: %s", e)
             stats['symbols_failed'] += 1
             self._complete_job_log(job_log.id, 'FAILED', 0, 0, str(e))
             stats['status'] = 'FAILED'
@@ -104,97 +162,259 @@ class ETLPipeline:
         stats['completed_at'] = datetime.now()
         return stats
 
+    def _load_symbol(
+        self,
+        load_id: int,
+        symbol: str,
+        start_date: date,
+        end_date: date,
+        skip_existing: bool = True,
+        prefetched: Optional[dict] = None,
+    ) -> dict:
+        """
+        Load one symbol and log it in a single session, committed once at the end.
+        """
+        try:
+            with get_session() as session:
+                result = self._process_symbol(session, symbol, start_date, end_date, skip_existing, prefetched)
+                self._log_symbol(session, load_id, symbol, 'SUCCESS', result['inserted'], result['skipped'])
+            return result
+        except BaseException:
+            # An instrument created in the rolled back session was never stored
+            self._instrument_cache.pop(symbol, None)
+            raise
+
     def _process_symbol(
         self,
+        session,
         symbol: str,
         start_date: date,
         end_date: date,
         skip_existing: bool = True,
+        prefetched: Optional[dict] = None,
     ) -> dict:
-        """Process a single symbol: extract, transform and load."""
+        """
+        Process a single symbol: extract, transform and load.
+
+        prefetched maps (symbol, fetch start) to prices already downloaded by
+        _prefetch_prices; the source is only asked when there is no entry for
+        the window this symbol needs.
+        """
+        logger.info("Processing %s...", symbol)
+
+        # Only ask the source for dates past what is already loaded
+        fetch_start = start_date
+        skipped = 0
+        existing_dates = set()
+        if skip_existing:
+            instrument_id = self._instrument_cache.get(symbol)
+            if instrument_id is not None:
+                existing_dates = self._existing_dates(session, instrument_id, start_date, end_date)
+
+            watermark = self._get_watermark(session, symbol)
+            fetch_start = _fetch_start(watermark, start_date, end_date)
+            if fetch_start is None:
+                logger.info("✓ %s already loaded through %s", symbol, watermark.last_loaded_date)
+                return {
+                    'inserted': 0,
+                    'skipped': len(existing_dates),
+                }
+            if fetch_start != start_date:
+                skipped = sum(1 for d in existing_dates if d < fetch_start)
 
         # Extract
-        df = self.source.fetch_prices(symbol, start_date, end_date)
-        print(f"  ✓ Extracted {len(df)} rows for {symbol} from {self.source.source_name}")
+        df = prefetched.get((symbol, fetch_start)) if prefetched else None
+        if df is None:
+            df = self.source.fetch_prices(symbol, fetch_start, end_date)
+        logger.info("✓ Extracted %d rows for %s from %s", len(df), symbol, self.source.source_name)
 
-        #Ensure instrument exists in database
-        instrument_id = self._ensure_instrument(symbol)
+        last_fetched = df['date'].max() if len(df) else None
 
-        # Transform and load
+        # Drop rows already stored before building insert records
+        if existing_dates:
+            is_new = ~df['date'].isin(existing_dates)
+            skipped += int((~is_new).sum())
+            df = df[is_new]
+
+        #Ensure instrument exists in database
+        instrument_id = self._ensure_instrument(session, symbol)
+
+        # Transform
+        prices = df.reindex(columns=PRICE_COLUMNS)
+        records = (
+            prices.astype(object)
+            .where(prices.notna(), None)
+            .assign(instrument_id=instrument_id, source=self.source.source_name)
+            .to_dict("records")
+        )
+
+        # Load: batched executemany, rows that already exist are left untouched
         inserted = 0
-        skipped = 0
+        stmt = self._insert_ignore_duplicates(session)
+        for i in range(0, len(records), INSERT_BATCH_SIZE):
+            result = session.execute(stmt, records[i:i + INSERT_BATCH_SIZE])
+            inserted += result.rowcount
 
-        with get_session() as session:
-            for _, row in df.iterrows():
-                #Check if this date already exists
-                if skip_existing:
-                    existing = session.query(PriceDaily).filter_by(
-                        instrument_id=instrument_id,
-                        date=row['date']
-                    ).first()
-
-                    if existing:
-                        skipped += 1
-                        continue
-
-                # Create new price daily record
-                price = PriceDaily(
-                    instrument_id=instrument_id,
-                    date=row['date'],
-                    open=row.get('open'),
-                    high=row.get('high', None),
-                    low=row.get('low', None),
-                    close=row.get('close', None),
-                    volume=row.get('volume', None),
-                    adj_close=row.get('adj_close', None),
-                    source=self.source.source_name,
-                )
-                try:
-                    session.add(price)
-                    session.flush()
-                    inserted += 1
-                except Exception as e:
-                    session.rollback()
-                    skipped += 1
-
-        print(f"    Inserted {inserted} records for {symbol}, skipped {skipped}")
+        if last_fetched is not None:
+            self._advance_watermark(session, instrument_id, fetch_start, end_date, last_fetched)
+
+        skipped += len(records) - inserted
+
+        logger.info("Inserted %d records for %s, skipped %d", inserted, symbol, skipped)
         return {
             'inserted': inserted,
             'skipped': skipped,
         }
 
-    def _ensure_instrument(self, symbol: str) -> int:
+    def _insert_ignore_duplicates(self, session):
+        """INSERT for prices_daily that skips rows already present for (instrument_id, date)."""
+        if session.get_bind().dialect.name == "sqlite":
+            stmt = sqlite_insert(PriceDaily.__table__)
+        else:
+            stmt = pg_insert(PriceDaily.__table__)
+        return stmt.on_conflict_do_nothing(index_elements=['instrument_id', 'date'])
+
+    def _prefetch_prices(
+        self,
+        symbols: list[str],
+        start_date: date,
+        end_date: date,
+        skip_existing: bool,
+    ) -> dict:
         """
-        Ensure instrument exists in database, create if not.
-        Returns instrument id.
+        Download prices for many symbols through the source's batched
+        fetch_multiple, one call per distinct fetch window.
+
+        Returns (symbol, fetch start) -> DataFrame. Sources without
+        fetch_multiple, and symbols it could not fetch, are left to the
+        per-symbol fetch_prices in _process_symbol, which reports failures.
         """
+        fetch_multiple = getattr(self.source, 'fetch_multiple', None)
+        if fetch_multiple is None or len(symbols) < 2:
+            return {}
+
+        watermarks = {}
+        if skip_existing:
+            ids = [self._instrument_cache[s] for s in symbols if s in self._instrument_cache]
+            with get_session() as session:
+                rows = (
+                    session.query(
+                        IngestionWatermark.instrument_id,
+                        IngestionWatermark.first_loaded_date,
+                        IngestionWatermark.last_loaded_date,
+                    )
+                    .filter(IngestionWatermark.instrument_id.in_(ids))
+                    .all()
+                )
+            # Rows carry the same date attributes _fetch_start reads
+            watermarks = {row.instrument_id: row for row in rows}
+
+        # Symbols sharing a window go into the same batch
+        windows: dict[date, list[str]] = {}
+        for symbol in symbols:
+            watermark = watermarks.get(self._instrument_cache.get(symbol))
+            fetch_start = _fetch_start(watermark, start_date, end_date)
+            if fetch_start is not None:
+                windows.setdefault(fetch_start, []).append(symbol)
+
+        prefetched = {}
+        for fetch_start, batch in windows.items():
+            try:
+                frames = fetch_multiple(batch, fetch_start, end_date)
+            except Exception as e:
+                logger.warning("Batched fetch failed, fetching %d symbols one at a time: %s", len(batch), e)
+                continue
+            prefetched.update({(symbol, fetch_start): df for symbol, df in frames.items()})
+        return prefetched
+
+    def _load_instrument_ids(self, symbols: list[str]):
+        """Cache ids of the instruments that already exist for symbols."""
+        missing = [s for s in symbols if s not in self._instrument_cache]
+        if not missing:
+            return
         with get_session() as session:
-            instrument = session.query(Instrument).filter_by(symbol=symbol).first()
-            if instrument:
-                return instrument.id
-
-            # get info from source and create 
-            print(f"   Creating instrument record for {symbol}...")
-            info = self.source.fetch_instrument_info(symbol)
-
-            asset_class_str = info.get('asset_class', 'equity')
-            asset_class = AssetClass(asset_class_str)
-
-            instrument = Instrument(
-                symbol=symbol,
-                name=info.get('name', symbol),
-                asset_class=asset_class,
-                exchange=info.get('exchange', 'Unknown'),
-                currency=info.get('currency', 'USD'),
-                first_trade_date=info.get('first_trade_date', None),
-                last_trade_date=info.get('last_trade_date', None),
-                sector=info.get('sector', 'Unknown'),
-                industry=info.get('industry', 'Unknown'),
+            rows = (
+                session.query(Instrument.symbol, Instrument.id)
+                .filter(Instrument.symbol.in_(missing))
+                .all()
             )
-            session.add(instrument)
-            session.flush() #get the id before commit 
+        self._instrument_cache.update(dict(rows))
+
+    def _get_watermark(self, session, symbol: str) -> Optional[IngestionWatermark]:
+        """Return the loaded date range for symbol, or None if nothing is tracked yet."""
+        instrument_id = self._instrument_cache.get(symbol)
+        if instrument_id is None:
+            return None
+        return session.get(IngestionWatermark, instrument_id)
+
+    def _existing_dates(self, session, instrument_id: int, start_date: date, end_date: date) -> set[date]:
+        """Dates with stored prices for instrument between start_date and end_date (inclusive)."""
+        params = {'instrument_id': instrument_id, 'start_date': start_date, 'end_date': end_date}
+        return set(session.execute(_EXISTING_DATES_STMT, params).scalars().all())
 
-            return instrument.id
+    def _advance_watermark(
+        self,
+        session,
+        instrument_id: int,
+        fetch_start: date,
+        fetch_end: date,
+        last_date: date,
+    ):
+        """
+        Extend the loaded range with a successful fetch.
+
+        The range only grows when the fetch overlaps it, so a disjoint load
+        never hides a gap in between.
+        """
+        watermark = session.get(IngestionWatermark, instrument_id)
+        if watermark is None:
+            session.add(IngestionWatermark(
+                instrument_id=instrument_id,
+                first_loaded_date=fetch_start,
+                last_loaded_date=last_date,
+            ))
+        elif fetch_start <= watermark.last_loaded_date and fetch_end >= watermark.first_loaded_date:
+            watermark.first_loaded_date = min(watermark.first_loaded_date, fetch_start)
+            watermark.last_loaded_date = max(watermark.last_loaded_date, last_date)
+
+    def _ensure_instrument(self, session, symbol: str) -> int:
+        """
+        Ensure instrument exists in database, create if not.
+        Returns instrument id.
+        """
+        if symbol in self._instrument_cache:
+            return self._instrument_cache[symbol]
+
+        instrument_id = session.execute(_INSTRUMENT_ID_STMT, {'symbol': symbol}).scalar()
+        if instrument_id is not None:
+            self._instrument_cache[symbol] = instrument_id
+            return instrument_id
+
+        # get info from source and create 
+        logger.info("Creating instrument record for %s...", symbol)
+        info = self._instrument_info.get(symbol)
+        if info is None:
+            info = self._instrument_info[symbol] = self.source.fetch_instrument_info(symbol)
+
+        asset_class_str = info.get('asset_class', 'equity')
+        asset_class = AssetClass(asset_class_str)
+
+        instrument = Instrument(
+            symbol=symbol,
+            name=info.get('name', symbol),
+            asset_class=asset_class,
+            exchange=info.get('exchange', 'Unknown'),
+            currency=info.get('currency', 'USD'),
+            first_trade_date=info.get('first_trade_date', None),
+            last_trade_date=info.get('last_trade_date', None),
+            sector=info.get('sector', 'Unknown'),
+            industry=info.get('industry', 'Unknown'),
+        )
+        session.add(instrument)
+        session.flush() #get the id before commit 
+
+        self._instrument_cache[symbol] = instrument.id
+        return instrument.id
 
     def _start_job_log(
         self,
@@ -221,6 +441,7 @@ class ETLPipeline:
 
     def _log_symbol(
         self,
+        session,
         load_id: int,
         symbol: str,
         status: str,
@@ -229,16 +450,15 @@ class ETLPipeline:
         error: Optional[str] = None,
     ):
         """Log individual symbol processing"""
-        with get_session() as session:
-            symbol_log = DataLoadSymbol(
-                load_log_id=load_id,
-                symbol=symbol,
-                status=status,
-                records_loaded=records,
-                records_skipped=skipped,
-                error_message=error,
-            )
-            session.add(symbol_log)
+        symbol_log = DataLoadSymbol(
+            load_log_id=load_id,
+            symbol=symbol,
+            status=status,
+            records_loaded=records,
+            records_skipped=skipped,
+            error_message=error,
+        )
+        session.add(symbol_log)
 
     def _complete_job_log(
         self,
@@ -101,12 +101,34 @@ class PriceDaily(Base):
     instrument = relationship("Instrument", back_populates="prices")
 
     # Constraints
+    # uq_instrument_date's index already serves (instrument_id, date) lookups.
+    # On PostgreSQL a second one carries close so the backtest price loader can
+    # read it with an index-only scan.
     __table_args__ = (
         UniqueConstraint("instrument_id", "date", name="uq_instrument_date"),
         Index("idx_prices_date", "date"),
-        Index("idx_prices_instrument_date", "instrument_id", "date"),
+        Index(
+            "idx_prices_instr_date_covering", "instrument_id", "date",
+            postgresql_include=["close"],
+        ).ddl_if(dialect="postgresql"),
     )
 
+class IngestionWatermark(Base):
+    """
+    Date range already loaded per instrument.
+
+    Lets the ETL pipeline ask data sources only for dates past what is
+    already stored instead of re-downloading the full range every run.
+    """
+
+    __tablename__ = "ingestion_watermarks"
+
+    instrument_id = Column(Integer, ForeignKey("instruments.id"), primary_key=True)
+    first_loaded_date = Column(Date, nullable=False)
+    last_loaded_date = Column(Date, nullable=False)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 class DataLoadLog(Base):
     """
     Tracks ETL job runs for auditing and debugging.
@@ -5,6 +5,7 @@ Maps FRED series to the standard so the same ETL and DB schema can be used.
 """
 
 from datetime import date, datetime 
+from functools import lru_cache
 from typing import Optional 
 import pandas as pd 
 from src.data.models import AssetClass
@@ -16,6 +17,16 @@ try:
 except ImportError:
     FRED_AVAILABLE = False
 
+@lru_cache(maxsize=1024)
+def _series_title(fred, symbol: str) -> str:
+    """
+    Title of a FRED series, remembered per client and symbol so repeated
+    metadata lookups skip the HTTPS round trip. Errors propagate and are
+    not cached.
+    """
+    info = fred.get_series_info(symbol)
+    return getattr(info, "title", symbol)
+
 class FREDSource(DataSource):
     """
     Federal Reserve Economic Data (FRED) data source connector.
@@ -69,8 +80,7 @@ class FREDSource(DataSource):
 
     def fetch_instrument_info(self, symbol: str) -> dict:
         try:
-            info = self._fred.get_series_info(symbol)
-            title = getattr(info, "title", symbol)
+            title = _series_title(self._fred, symbol)
         except Exception as e:
             title = symbol 
         return {
@@ -6,6 +6,8 @@ Yahoo Finance is free and good for learning/prototyping but production systems
 should use Bloomberg, Refinitive or similar
 """
 
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
 from datetime import date, datetime 
 from typing import Optional 
 import pandas as pd 
@@ -14,6 +16,30 @@ import yfinance as yf
 from src.data.sources.base import DataSource, DataSource_error
 from src.data.models import AssetClass
 
+logger = logging.getLogger(__name__)
+
+# Symbols per yf.download request in fetch_multiple
+DOWNLOAD_CHUNK_SIZE = 20
+
+# yfinance quoteType -> AssetClass; anything not listed is treated as equity
+ASSET_CLASS_BY_QUOTE_TYPE = {
+    'EQUITY': AssetClass.EQUITY,
+    'ETF': AssetClass.ETF,
+    'FUTURE': AssetClass.FUTURE,
+    'OPTION': AssetClass.OPTION,
+    'FOREX': AssetClass.FOREX,
+    'CRYPTOCURRENCY': AssetClass.CRYPTO,
+    'INDEX': AssetClass.EQUITY,
+    'MUTUALFUND': AssetClass.ETF,
+    'BOND': AssetClass.EQUITY,
+    'COMMODITY': AssetClass.EQUITY,
+    'OTHER': AssetClass.EQUITY,
+}
+
+def _exclusive_end(end_date: date) -> str:
+    """Yahoo's end date is exclusive; the day after end_date as YYYY-MM-DD."""
+    return (datetime.combine(end_date, datetime.min.time()) + pd.Timedelta(days=1)).strftime('%Y-%m-%d')
+
 class YFinanceSource(DataSource):
     """
     Yahoo Finance data source connector.
@@ -49,45 +75,47 @@ class YFinanceSource(DataSource):
 
             df = ticker.history(
                 start = start_date.isoformat(),
-                end = (datetime.combine(end_date, datetime.min.time()) + pd.Timedelta(days=1)).strftime('%Y-%m-%d'),
+                end = _exclusive_end(end_date),
                 auto_adjust = False # Keep both close and Adj close
             )
 
             if df.empty:
                 raise DataSource_error(f"No data found for {symbol}")
 
-            df = df.reset_index()
-            df.columns = df.columns.str.lower().str.replace(' ', '_')
-
-            #Rename columns to match our standard
-            column_mapping = {
-                'date': 'date',
-                'open': 'open',
-                'high': 'high',
-                'low': 'low',
-                'close': 'close',
-                'volume': 'volume',
-                'adjclose': 'adj_close',
-            }
+            return self._standardize(df, symbol)
 
-            # Keep only columns we need 
-            df = df[[col for col in column_mapping.keys() if col in df.columns]]
-            df = df.rename(columns=column_mapping)
+        except Exception as e:
+            raise DataSource_error(f"Error fetching prices for {symbol}: {str(e)}") from e
 
-            #convert date to data type 
-            df['date'] = pd.to_datetime(df['date']).dt.date
+    def _standardize(self, df: pd.DataFrame, symbol: str) -> pd.DataFrame:
+        """Turn one symbol's date-indexed Yahoo frame into the standard price columns."""
+        df = df.reset_index()
+        df.columns = df.columns.str.lower().str.replace(' ', '_')
+
+        #Rename columns to match our standard
+        column_mapping = {
+            'date': 'date',
+            'open': 'open',
+            'high': 'high',
+            'low': 'low',
+            'close': 'close',
+            'volume': 'volume',
+            'adjclose': 'adj_close',
+        }
 
-            # Add source identifier 
-            df['source'] = self.source_name
-            df['symbol'] = symbol
+        # Keep only columns we need 
+        df = df[[col for col in column_mapping.keys() if col in df.columns]]
+        df = df.rename(columns=column_mapping)
 
-            # validate using base class method
-            df = self.validate_data(df)
+        #convert date to data type 
+        df['date'] = pd.to_datetime(df['date']).dt.date
 
-            return df 
+        # Add source identifier 
+        df['source'] = self.source_name
+        df['symbol'] = symbol
 
-        except Exception as e:
-            raise DataSource_error(f"Error fetching prices for {symbol}: {str(e)}") from e
+        # validate using base class method
+        return self.validate_data(df)
 
     def fetch_instrument_info(self, symbol: str) -> dict:
         """
@@ -120,22 +148,7 @@ class YFinanceSource(DataSource):
     def _infer_asset_class(self, info: dict) -> str:
         """Infer asset class from yfinance info."""
         quote_type = info.get('quoteType', '').upper()
-
-        mapping = {
-            'EQUITY': AssetClass.EQUITY,
-            'ETF': AssetClass.ETF,
-            'FUTURE': AssetClass.FUTURE,
-            'OPTION': AssetClass.OPTION,
-            'FOREX': AssetClass.FOREX,
-            'CRYPTOCURRENCY': AssetClass.CRYPTO,
-            'INDEX': AssetClass.EQUITY,
-            'MUTUALFUND': AssetClass.ETF,
-            'BOND': AssetClass.EQUITY,
-            'COMMODITY': AssetClass.EQUITY,
-            'OTHER': AssetClass.EQUITY,
-        }
-
-        return mapping.get(quote_type, AssetClass.EQUITY)
+        return ASSET_CLASS_BY_QUOTE_TYPE.get(quote_type, AssetClass.EQUITY)
          
 
     def fetch_multiple(
@@ -143,23 +156,94 @@ class YFinanceSource(DataSource):
         symbols: list[str],
         start_date: date,
         end_date: date,
+        max_workers: int = 8,
+        timeout: Optional[float] = None,
     ) -> dict[str, pd.DataFrame]:
         """
         Fetch prices for multiple symbols and date range.
 
+        Symbols are downloaded DOWNLOAD_CHUNK_SIZE at a time with yf.download,
+        and the chunks run concurrently in a thread pool, since each one
+        mostly waits on the network.
+
+        Args:
+            max_workers: Number of chunks fetched at the same time
+            timeout: Seconds to wait for the whole batch; symbols still
+                pending after that are dropped
+
         Returns:
-            Dict of symbol -> DataFrame with columns: date, open, high, low, close, volume
-            Failed symbols are skipped with a warning
+            Dict of symbol -> DataFrame with columns: date, open, high, low, close, volume,
+            in the order of symbols. Failed symbols are skipped with a warning
         """
 
         results = {}
 
+        chunks = [symbols[i:i + DOWNLOAD_CHUNK_SIZE] for i in range(0, len(symbols), DOWNLOAD_CHUNK_SIZE)]
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        futures = {
+            executor.submit(self._download_chunk, chunk, start_date, end_date): chunk
+            for chunk in chunks
+        }
+        try:
+            for future in as_completed(futures, timeout=timeout):
+                try:
+                    frames = future.result()
+                except DataSource_error as e:
+                    logger.warning("✗ %s: %s", ", ".join(futures[future]), e)
+                    continue
+                for symbol, df in frames.items():
+                    if isinstance(df, DataSource_error):
+                        logger.warning("✗ %s: %s", symbol, df)
+                    else:
+                        results[symbol] = df
+                        logger.info("✓ %s: %d rows", symbol, len(df))
+        except FuturesTimeoutError:
+            pending = [s for f, chunk in futures.items() if not f.done() for s in chunk]
+            logger.warning("✗ Timed out after %ss waiting for: %s", timeout, ", ".join(pending))
+        finally:
+            # Don't block on requests that overran the timeout
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return {symbol: results[symbol] for symbol in symbols if symbol in results}
+
+    def _download_chunk(
+        self,
+        symbols: list[str],
+        start_date: date,
+        end_date: date,
+    ) -> dict[str, "pd.DataFrame | DataSource_error"]:
+        """
+        Download several symbols with one yf.download call.
+
+        Returns symbol -> standardized DataFrame, or the DataSource_error for a
+        symbol that came back without data.
+        """
+        try:
+            raw = yf.download(
+                tickers=" ".join(symbols),
+                start=start_date.isoformat(),
+                end=_exclusive_end(end_date),
+                group_by='ticker',
+                auto_adjust=False, # Keep both close and Adj close
+                threads=True,
+                progress=False,
+            )
+        except Exception as e:
+            raise DataSource_error(f"Error downloading prices: {str(e)}") from e
+
+        frames = {}
         for symbol in symbols:
             try:
-                df = self.fetch_prices(symbol, start_date, end_date)
-                results[symbol] = df
-                print(f"  ✓ {symbol}: {len(df)} rows")
+                if isinstance(raw.columns, pd.MultiIndex):
+                    if symbol not in raw.columns.get_level_values(0):
+                        raise DataSource_error(f"No data found for {symbol}")
+                    df = raw[symbol]
+                else:
+                    df = raw
+                df = df.dropna(how='all')
+                if df.empty:
+                    raise DataSource_error(f"No data found for {symbol}")
+                frames[symbol] = self._standardize(df, symbol)
             except DataSource_error as e:
-                print(f"  ✗ {symbol}: {e}")
-
-        return results
\ No newline at end of file
+                frames[symbol] = e
+        return frames
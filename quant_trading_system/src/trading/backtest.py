@@ -7,9 +7,24 @@ Evaluates trading strategies using historical price data without lookahead bias.
 import pandas as pd
 import numpy as np
 from dataclasses import dataclass
+from functools import cached_property
 import matplotlib.pyplot as plt
 from typing import Optional
 
+try:
+    import bottleneck as bn
+    BOTTLENECK_AVAILABLE = True
+except ImportError:
+    BOTTLENECK_AVAILABLE = False
+
+from src.analytics._kernels import (
+    NUMBA_AVAILABLE,
+    PARALLEL_LOCK,
+    asset_stats_2d,
+    strategy_returns_kernel,
+    vol_target_scale,
+)
+
 @dataclass
 class BacktestResult:
     """Results of a backtest simulation."""
@@ -21,7 +36,6 @@ class BacktestResult:
     sharpe_ratio: float
     trades: pd.DataFrame
     positions: pd.DataFrame
-    weights: pd.DataFrame
     signals: pd.DataFrame
     win_rate: float
     per_asset_equity: pd.DataFrame
@@ -30,6 +44,21 @@ class BacktestResult:
     per_asset_max_drawdown: pd.DataFrame
     per_asset_win_rate: pd.DataFrame
     equity: pd.Series
+    rolling_max: pd.Series
+    drawdowns: pd.Series
+
+    @cached_property
+    def weights(self) -> pd.DataFrame:
+        """
+        Positions as a fraction of each day's gross exposure (NaN on days with
+        none). Nothing in the engine needs them, so they are computed on first
+        access rather than on every run.
+        """
+        return pd.DataFrame(
+            _gross_weights(self.positions.to_numpy()),
+            index=self.positions.index,
+            columns=self.positions.columns,
+        )
 
 class BacktestEngine:
     """
@@ -59,40 +88,57 @@ class BacktestEngine:
 
         Args:
             prices: DataFrame with historical prices (columns = symbols, index = dates)
-            signals: Trading signals -1,0,+1 same index as prices
+            signals: Trading signals -1,0,+1 same index as prices. Any numeric
+                dtype works; int8 is enough and is upcast to float only for the
+                position / P&L math, so callers can keep the compact frame.
         """
 
         if prices.shape != signals.shape:
             raise ValueError("Prices and signals must have the same shape")
 
         prices = prices.sort_index()
-        signals = signals.reindex(prices.index).ffill().fillna(0)
+        # The P&L pass pairs columns by position, so put the signals in the
+        # prices' symbol order first (a column selection keeps their dtype)
+        if not signals.columns.equals(prices.columns):
+            if set(signals.columns) != set(prices.columns):
+                raise ValueError("Prices and signals must have the same columns (symbols)")
+            signals = signals[prices.columns]
+        # int8 {-1, 0, +1} signals go to the P&L pass as they are (one byte per
+        # cell, no float copy of the panel). Reindexing introduces NaN and
+        # upcasts them to float64, so it is skipped when they already line up
+        # with the prices, and the filled result is narrowed back to int8.
+        signal_dtype = np.int8 if (signals.dtypes == np.int8).all() else np.float32
+        if not signals.index.equals(prices.index):
+            signals = signals.reindex(prices.index).ffill().fillna(0)
+        elif signal_dtype is np.float32 and signals.isna().to_numpy().any():
+            signals = signals.ffill().fillna(0)
+
+        # Panel math runs on float32 NumPy arrays in column (symbol) major
+        # order; per-asset reductions walk contiguous columns and DataFrames
+        # are only built for the outputs.
+        index, columns = prices.index, prices.columns
+        n_assets = prices.shape[1]
 
         # Use previous-day signals to size positions
-        # Signal at t-1 -> position at t -> PnL from return t
-        raw_positions = signals.shift(1).fillna(0)
-        
-        # raw returns
-        returns = prices.pct_change().fillna(0)
+        # Signal at t-1 -> position at t -> PnL from return t, net of
+        # transaction costs and slippage on the position change
+        positions, strategy_returns, total_changes = _strategy_returns(
+            prices.to_numpy(dtype=np.float64),
+            signals.to_numpy(dtype=signal_dtype),
+            self.transaction_costs + self.slippage,
+        )
 
-        # Apply transaction costs and slippage
-        position_changes = raw_positions.diff().abs()
-        costs = (self.transaction_costs + self.slippage) * position_changes
-        strategy_returns = raw_positions * returns
-        strategy_returns -= costs
+        if self.target_volatility is not None:
+            _apply_vol_target(positions, strategy_returns, 21, self.target_volatility)
 
-        positions = raw_positions.copy()
+        valid = ~np.isnan(strategy_returns)
+        filled_returns = np.where(valid, strategy_returns, 0)
 
-        if self.target_volatility is not None:
-            rolling_vol = strategy_returns.rolling(window=21).std() * np.sqrt(252)
-            vol_scale = self.target_volatility / rolling_vol
-            vol_scale = vol_scale.clip(0,2).fillna(1)
-            strategy_returns *= vol_scale
-            positions *= vol_scale
-            
-        # cumulative equtiy
-        daily_portfolio_return = strategy_returns.mean(axis=1)
-        equity = (1 + daily_portfolio_return).cumprod() * self.initial_capital
+        # cumulative equtiy (per-day mean over assets, skipping NaN)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            daily_mean = filled_returns.sum(axis=1, dtype=np.float64) / valid.sum(axis=1)
+        daily_portfolio_return = pd.Series(daily_mean, index=index)
+        equity = pd.Series(_nan_cumprod(1 + daily_mean), index=index) * self.initial_capital
 
         # total return
         cumulative_return = equity.iloc[-1] / self.initial_capital - 1
@@ -103,18 +149,20 @@ class BacktestEngine:
         sharpe = excess_returns.mean() / excess_returns.std() * np.sqrt(252)
         sharpe = sharpe if not np.isnan(sharpe) else 0
 
-        # Max drawdown
+        # Max drawdown; the running peak and drawdown series are kept on the
+        # result for diagnostics and plots
         rolling_max = equity.cummax()
         drawdowns = (equity - rolling_max) / rolling_max
         max_drawdown = drawdowns.min()
 
         # Trade count (position changes)
-        trade_dates = position_changes.sum(axis=1).loc[lambda x: x!=0].index
+        traded = total_changes != 0
+        trade_dates = index[traded]
         position_changes_df = pd.DataFrame({
             'date': trade_dates,
-            'total_position_change': position_changes.sum(axis=1).loc[trade_dates],
-            'equity': equity.loc[trade_dates],
-        })
+            'total_position_change': total_changes[traded],
+            'equity': equity.to_numpy()[traded],
+        }, index=trade_dates)
 
         # Win rate of nonzero return days
         winning_days = (daily_portfolio_return > 0).sum()
@@ -122,12 +170,18 @@ class BacktestEngine:
         win_rate = winning_days / total_trade_days if total_trade_days > 0 else 0
 
         # per asset metrics
-        per_asset_equity = (1 + strategy_returns).cumprod() * (self.initial_capital / prices.shape[1])
+        per_asset_equity, asset_mean, asset_std, asset_max_drawdown, asset_win_rate = _asset_stats(
+            strategy_returns, self.initial_capital / n_assets
+        )
+        per_asset_equity = pd.DataFrame(per_asset_equity, index=index, columns=columns)
         per_asset_cumulative_return = per_asset_equity.iloc[-1] / per_asset_equity.iloc[0] - 1
-        per_asset_sharpe = (strategy_returns.mean() / strategy_returns.std()).mul(np.sqrt(252)).fillna(0)
-        per_asset_rolling_max = per_asset_equity.cummax()
-        per_asset_max_drawdown = ((per_asset_equity - per_asset_rolling_max) / per_asset_rolling_max).min()
-        per_asset_win_rate = ((strategy_returns > 0).sum() / (strategy_returns != 0).sum()).fillna(0)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            per_asset_sharpe = pd.Series(asset_mean / asset_std * np.sqrt(252), index=columns).fillna(0)
+        per_asset_max_drawdown = pd.Series(asset_max_drawdown, index=columns)
+        per_asset_win_rate = pd.Series(asset_win_rate, index=columns).fillna(0)
+
+        positions_df = pd.DataFrame(positions, index=index, columns=columns)
 
         if self.verbose:
             print(f"\nBacktest results:")
@@ -150,8 +204,7 @@ class BacktestEngine:
             max_drawdown=max_drawdown,
             sharpe_ratio=sharpe,
             trades=position_changes_df,
-            positions=positions,
-            weights=positions.div(positions.abs().sum(axis=1), axis=0),
+            positions=positions_df,
             signals=signals,
             win_rate=win_rate,
             per_asset_equity=per_asset_equity,
@@ -160,8 +213,133 @@ class BacktestEngine:
             per_asset_max_drawdown=per_asset_max_drawdown,
             per_asset_win_rate=per_asset_win_rate,
             equity=equity,
+            rolling_max=rolling_max,
+            drawdowns=drawdowns,
         )
 
+def _rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Column-wise rolling(window).std(), using bottleneck's moving std when it is
+    installed, else pandas.
+    """
+    # bottleneck rejects windows longer than the series
+    if BOTTLENECK_AVAILABLE and len(values) >= window:
+        return bn.move_std(values.astype(np.float64), window=window, min_count=window, axis=0, ddof=1)
+    return pd.DataFrame(values).rolling(window=window).std().to_numpy()
+
+def _strategy_returns(prices: np.ndarray, signals: np.ndarray, cost_rate: float):
+    """
+    Lagged positions, strategy returns and per-day total position change.
+
+    positions[t] = signals[t - 1] (0 on the first day) and
+    strategy_returns[t] = positions[t] * return[t] - cost_rate * |positions[t] - positions[t - 1]|,
+    NaN on the first day. Returns are pct_change with NaN as 0, taken in
+    float64. The panels are float32 and column-major. With numba this is a
+    single fused pass over the panel.
+    """
+    if NUMBA_AVAILABLE:
+        with PARALLEL_LOCK:
+            positions, strategy_returns, position_changes = strategy_returns_kernel(prices, signals, cost_rate)
+        return positions, strategy_returns, position_changes.sum(axis=1, dtype=np.float64)
+
+    panel = lambda: np.empty(prices.shape, dtype=np.float32, order='F')
+
+    positions = panel()
+    positions[0] = 0
+    positions[1:] = signals[:-1]
+
+    # the ratio is taken in float64 so small returns keep their precision in float32
+    returns = panel()
+    returns[0] = 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns[1:] = prices[1:] / prices[:-1] - 1
+    returns[np.isnan(returns)] = 0
+
+    position_changes = panel()
+    position_changes[0] = 0
+    np.subtract(positions[1:], positions[:-1], out=position_changes[1:])
+    np.abs(position_changes[1:], out=position_changes[1:])
+    # Row totals for the trade log, taken before the buffer is reused for costs
+    total_changes = position_changes.sum(axis=1, dtype=np.float64)
+
+    # positions are already lagged a day, so the PnL is one multiply over
+    # the returns buffer; the cost panel reuses the changes buffer
+    strategy_returns = returns
+    strategy_returns[0] = np.nan
+    with np.errstate(invalid='ignore'):
+        np.multiply(positions[1:], returns[1:], out=strategy_returns[1:])
+    costs = np.multiply(position_changes[1:], cost_rate, out=position_changes[1:])
+    strategy_returns[1:] -= costs
+    return positions, strategy_returns, total_changes
+
+def _gross_weights(positions: np.ndarray) -> np.ndarray:
+    """
+    Positions divided by the row's gross (absolute) exposure; rows with no
+    exposure give NaN, as 0 / 0 does.
+    """
+    gross = np.abs(positions).sum(axis=1, dtype=np.float32)
+    # One division per row, then a broadcast multiply
+    with np.errstate(divide='ignore'):
+        inv_gross = np.float32(1.0) / gross
+    with np.errstate(invalid='ignore'):
+        return positions * inv_gross[:, None]
+
+def _apply_vol_target(
+    positions: np.ndarray,
+    strategy_returns: np.ndarray,
+    window: int,
+    target: float,
+) -> None:
+    """
+    Scale positions and strategy returns in place toward the target volatility,
+    using the annualized rolling(window) std of the returns. With numba the
+    rolling vol and the scaling run in one pass per column, with no vol panel
+    allocated.
+    """
+    if NUMBA_AVAILABLE:
+        with PARALLEL_LOCK:
+            vol_target_scale(positions, strategy_returns, window, target)
+        return
+    rolling_vol = _rolling_std(strategy_returns, window) * np.sqrt(252)
+    with np.errstate(divide='ignore'):
+        vol_scale = target / rolling_vol
+    vol_scale = np.clip(vol_scale, 0, 2)
+    vol_scale[np.isnan(vol_scale)] = 1
+    strategy_returns *= vol_scale
+    positions *= vol_scale
+
+def _asset_stats(strategy_returns: np.ndarray, capital: float):
+    """
+    Per-asset equity (capital compounded over the non-NaN returns) and, per
+    column, the mean and sample std of the returns, the maximum drawdown of
+    the equity and the win rate of nonzero return days (NaN when undefined).
+    With numba this is one fused pass per column.
+    """
+    if NUMBA_AVAILABLE:
+        with PARALLEL_LOCK:
+            return asset_stats_2d(strategy_returns, capital)
+
+    equity = _nan_cumprod(1 + strategy_returns.astype(np.float64)) * capital
+
+    valid = ~np.isnan(strategy_returns)
+    counts = valid.sum(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = np.where(valid, strategy_returns, 0).sum(axis=0, dtype=np.float64) / counts
+        deviations = np.where(valid, strategy_returns - mean, 0)
+        std = np.sqrt((deviations ** 2).sum(axis=0, dtype=np.float64) / (counts - 1))
+
+        rolling_max = pd.DataFrame(equity).cummax()
+        max_drawdown = ((equity - rolling_max) / rolling_max).min().to_numpy()
+
+        win_rate = (strategy_returns > 0).sum(axis=0) / (strategy_returns != 0).sum(axis=0)
+    return equity, mean, std, max_drawdown, win_rate
+
+def _nan_cumprod(values: np.ndarray) -> np.ndarray:
+    """Cumulative product along axis 0 that skips NaN and keeps it in place, like pandas cumprod."""
+    out = np.nancumprod(values, axis=0)
+    out[np.isnan(values)] = np.nan
+    return out
+
 def run_backtest(
     prices: pd.DataFrame,
     signals: pd.DataFrame,
@@ -200,8 +378,16 @@ def plot_backtest_results(result: BacktestResult, show_drawdown: bool = True, sh
     # Portfolio equity curve
     plt.plot(result.equity.index, result.equity, label = 'Portfolio Equity', color='black', linewidth=2)
 
-    for col in result.per_asset_equity.columns:
-        plt.plot(result.per_asset_equity.index, result.per_asset_equity[col], label=f'{col} Equity', linewidth=1.2, alpha = .8)
+    per_asset_equity = result.per_asset_equity
+    # One plot call over the 2D equity array (one line per column)
+    # instead of a call per symbol
+    plt.plot(
+        per_asset_equity.index,
+        per_asset_equity.to_numpy(),
+        label=[f'{col} Equity' for col in per_asset_equity.columns],
+        linewidth=1.2,
+        alpha=.8,
+    )
 
     plt.title('Portfolio and per asset equity curves')
     plt.xlabel('Date')
@@ -214,7 +400,7 @@ def plot_backtest_results(result: BacktestResult, show_drawdown: bool = True, sh
     if show_drawdown:
         plt.figure(figsize=(14,8))
         # portfolio_equtiy = result.trades['equity'].reindex(result.per_asset_equity.index).ffill()
-        portfolio_drawdown = (result.equity - result.equity.cummax()) / result.equity.cummax()
+        portfolio_drawdown = result.drawdowns
         plt.plot(portfolio_drawdown.index, portfolio_drawdown, label='Portfolio Drawdown', color='red')
         plt.title('Portfolio Drawdown')
         plt.xlabel('Date')
@@ -225,8 +411,13 @@ def plot_backtest_results(result: BacktestResult, show_drawdown: bool = True, sh
 
     if show_per_asset:
         plt.figure(figsize=(14,8))
-        for col in result.per_asset_equity.columns:
-            plt.plot(result.per_asset_equity.index, result.per_asset_equity[col], label=f'{col} Equity', linewidth=1.2, alpha = .8)
+        plt.plot(
+            per_asset_equity.index,
+            per_asset_equity.to_numpy(),
+            label=[f'{col} Equity' for col in per_asset_equity.columns],
+            linewidth=1.2,
+            alpha=.8,
+        )
         plt.title('Per Asset Equity Curves')
         plt.xlabel('Date')
         plt.ylabel('Equity ($)')
@@ -4,33 +4,72 @@ Helpers for loading price data and building signals for backtests.
 Used by the Streamlit app and by test/script backtest runs.
 """
 
+import numpy as np
 import pandas as pd
+from sqlalchemy import select
 
+from src.analytics._kernels import PARALLEL_LOCK, build_signals_nb
+from src.analytics.signals import SignalCombiner, MomentumSignal, RSISignal, MACDSignal
 from src.data.models import PriceDaily
 
+# Rows fetched per round trip while streaming prices out of the database
+LOAD_BATCH_SIZE = 10_000
+
 
 def load_multi_asset_prices(session, instruments, symbols):
     """Load close prices for multiple symbols into a DataFrame (columns=symbols, index=date)."""
-    close_dfs = []
-    for inst in instruments:
-        if inst.symbol not in symbols:
-            continue
-        rows = (
-            session.query(PriceDaily)
-            .filter(PriceDaily.instrument_id == inst.id)
-            .order_by(PriceDaily.date)
-            .all()
-        )
-        if not rows:
-            continue
-        close_dfs.append(
-            pd.DataFrame(
-                {"date": [r.date for r in rows], inst.symbol: [r.close for r in rows]}
-            ).set_index("date")
-        )
-    if not close_dfs:
+    id_to_symbol = {inst.id: inst.symbol for inst in instruments if inst.symbol in symbols}
+    if not id_to_symbol:
+        return None
+
+    # One Core query for all symbols by instrument id (no join against
+    # instruments), streamed in batches; each batch becomes typed arrays so
+    # only one batch of row tuples is alive at a time, then pivoted to wide form
+    stmt = (
+        select(PriceDaily.date, PriceDaily.instrument_id, PriceDaily.close)
+        .where(PriceDaily.instrument_id.in_(list(id_to_symbol)))
+        .order_by(PriceDaily.date)
+        .execution_options(yield_per=LOAD_BATCH_SIZE)
+    )
+    date_parts, id_parts, close_parts = [], [], []
+    for batch in session.execute(stmt).partitions():
+        batch_dates, batch_ids, batch_closes = zip(*batch)
+        date_parts.append(np.array(batch_dates, dtype=object))
+        id_parts.append(np.array(batch_ids, dtype=np.int32))
+        close_parts.append(np.array(batch_closes, dtype=np.float64))
+    if not date_parts:
         return None
-    return pd.concat(close_dfs, axis=1).sort_index().ffill().bfill().dropna(how="all")
+
+    dates = np.concatenate(date_parts)
+    instrument_ids = np.concatenate(id_parts)
+    closes = np.concatenate(close_parts)
+
+    # Scatter the closes straight into one preallocated (dates x symbols)
+    # column-major array instead of pivoting. Rows arrive ordered by date, so
+    # factorize numbers the dates in sorted order
+    rows, index = pd.factorize(dates)
+    present = set(np.unique(instrument_ids).tolist())
+    column_ids = np.array([iid for iid in id_to_symbol if iid in present], dtype=np.int32)
+    sorter = np.argsort(column_ids)
+    cols = sorter[np.searchsorted(column_ids, instrument_ids, sorter=sorter)]
+    panel = np.full((len(index), len(column_ids)), np.nan, order="F")
+    panel[rows, cols] = closes
+
+    close_df = pd.DataFrame(
+        panel,
+        index=pd.Index(index, name="date"),
+        columns=[id_to_symbol[iid] for iid in column_ids.tolist()],
+        copy=False,
+    )
+    close_df = close_df.ffill().bfill().dropna(how="all")
+    # Column (symbol) major float64: the feature kernels and the backtest walk
+    # one symbol at a time, so each column is a contiguous view, not a copy
+    return pd.DataFrame(
+        np.asfortranarray(close_df.to_numpy(dtype=np.float64)),
+        index=close_df.index,
+        columns=close_df.columns,
+        copy=False,
+    )
 
 
 def build_signals_for_symbol(engine, close_series, signal_gen):
@@ -38,3 +77,64 @@ def build_signals_for_symbol(engine, close_series, signal_gen):
     df = close_series.to_frame(name="close")
     features = engine.compute_all(df)
     return signal_gen.generate(features)
+
+
+def build_signals(engine, price_df, signal_gen):
+    """
+    Compute features for all symbols in one pass and generate a signal per symbol.
+
+    Returns a DataFrame of signals (columns=symbols, index=date).
+    """
+    features = engine.compute_all_multi(price_df)
+
+    params = _kernel_params(signal_gen, features)
+    if params is not None and price_df.shape[1] > 1:
+        sma_col, params = params
+        with PARALLEL_LOCK:
+            signals = build_signals_nb(
+                features['close'].to_numpy(),
+                features[sma_col].to_numpy(),
+                features['rsi_14'].to_numpy(),
+                features['macd_histogram'].to_numpy(),
+                *params,
+            )
+        return pd.DataFrame(signals, index=price_df.index, columns=price_df.columns)
+
+    return pd.DataFrame(
+        {sym: signal_gen.generate(features.xs(sym, axis=1, level=1)) for sym in price_df.columns}
+    )
+
+
+def _kernel_params(signal_gen, features: pd.DataFrame):
+    """
+    (sma column, remaining build_signals_nb arguments) if signal_gen is a
+    SignalCombiner made only of MomentumSignal, RSISignal and MACDSignal (each
+    at most once), else None.
+    """
+    if type(signal_gen) is not SignalCombiner:
+        return None
+
+    slots = {MomentumSignal: 0, RSISignal: 1, MACDSignal: 2}
+    weights = np.zeros(3, dtype=np.float32)
+    seen = set()
+    oversold, overbought = 0.0, 0.0
+    # Without a momentum signal its weight is 0; close - close keeps it at 0
+    sma_col = 'close'
+    for sig, weight in zip(signal_gen.signals.values(), signal_gen.weights_arr):
+        slot = slots.get(type(sig))
+        if slot is None or slot in seen:
+            return None
+        seen.add(slot)
+        weights[slot] = weight
+        if isinstance(sig, RSISignal):
+            oversold, overbought = float(sig.oversold), float(sig.overbought)
+        elif isinstance(sig, MomentumSignal):
+            sma_col = sig.sma_col
+    if not seen or sma_col not in features.columns.get_level_values(0):
+        # A missing SMA column is reported by MomentumSignal.generate
+        return None
+
+    lower, upper = signal_gen.thresholds
+    if lower != -upper:
+        return None
+    return sma_col, (weights, float(signal_gen.total_weight), oversold, overbought, float(upper))
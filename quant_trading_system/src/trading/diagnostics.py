@@ -3,7 +3,7 @@ Diagnostic tools for backtesting.
 Computes risk and diagnostics from backtest results.
 """
 
-import pandas as pd
+import numpy as np
 from src.trading.backtest import BacktestResult
 
 class DiagnosticEngine:
@@ -21,9 +21,7 @@ class DiagnosticEngine:
         Finds the date when drawdown was worst, then the last peak before it; returns days between.
         """
         equity = self.result.equity
-        rolling_max = equity.cummax()
-        drawdowns = (equity - rolling_max) / rolling_max
-        trough_date = drawdowns.idxmin()
+        trough_date = self.result.drawdowns.idxmin()
         peak_date = equity.loc[:trough_date].idxmax()
         return int((equity.index.get_loc(trough_date) - equity.index.get_loc(peak_date)))
 
@@ -32,22 +30,22 @@ class DiagnosticEngine:
         Longest contiguous run of trading days below the running peak (any drawdown period).
         Can span most of the backtest if equity never makes a new high after an early peak.
         """
-        equity = self.result.equity
-        rolling_max = equity.cummax()
-        drawdowns = (equity - rolling_max) / rolling_max
-        in_drawdown = drawdowns < 0
-        period_id = (in_drawdown != in_drawdown.shift()).cumsum()
-        days_per_run = in_drawdown.groupby(period_id).sum()
-        return int(days_per_run.max()) if len(days_per_run) else 0
+        in_drawdown = self.result.drawdowns.to_numpy() < 0
+        # Padded with False on both sides, runs start and end where the mask flips
+        edges = np.flatnonzero(np.diff(np.r_[False, in_drawdown, False].view(np.int8)))
+        run_lengths = edges[1::2] - edges[::2]
+        return int(run_lengths.max()) if len(run_lengths) else 0
 
     def turnover(self, annualize: bool = True) -> float:
         """
         Average daily turnover (sum of absolute position changes across assets).
         If annualize=True, returns mean daily turnover * 252.
         """
-        pos = self.result.positions
-        daily_turnover = pos.diff().abs().sum(axis=1).fillna(0)
-        mean_daily = daily_turnover.mean()
+        pos = self.result.positions.to_numpy()
+        # Mean of the daily sums is the total over all days and assets divided
+        # by the day count (the first day has no change and counts as 0), so
+        # abs and sum fuse into one reduction with no intermediate frames
+        mean_daily = np.nansum(np.abs(np.diff(pos, axis=0)), dtype=np.float64) / len(pos)
         return mean_daily * 252 if annualize else mean_daily
 
     def report(self) -> dict:
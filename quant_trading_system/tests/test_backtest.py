@@ -3,9 +3,12 @@
 import sys
 sys.path.insert(0, ".")
 
+import numpy as np
 import pandas as pd
+import pytest
+
 from src.trading.backtest import BacktestEngine, run_backtest, plot_backtest_results
-from src.trading.backtest_helpers import load_multi_asset_prices, build_signals_for_symbol
+from src.trading.backtest_helpers import load_multi_asset_prices, build_signals
 from src.data.database import get_session, init_database
 from src.data.models import Instrument, PriceDaily
 from src.analytics.features import FeatureEngine
@@ -36,7 +39,7 @@ if __name__ == "__main__":
         # Align on common dates and drop rows with missing prices
         price_df = price_df.dropna()
 
-        # Combined signal: momentum + RSI + MACD (equal weight). Applied per asset.
+        # Combined signal: momentum + RSI + MACD (equal weight), per asset.
         engine = FeatureEngine()
         signal_combiner = SignalCombiner(
             signals={
@@ -45,12 +48,8 @@ if __name__ == "__main__":
                 "macd": MACDSignal(),
             }
         )
-        signals_df = pd.DataFrame(
-            {
-                sym: build_signals_for_symbol(engine, price_df[sym], signal_combiner)
-                for sym in price_df.columns
-            }
-        )
+        # Features and signals for every symbol in one pass over the panel
+        signals_df = build_signals(engine, price_df, signal_combiner)
         signals_df = signals_df.reindex(price_df.index).ffill().fillna(0)
 
         assert price_df.shape == signals_df.shape, (
@@ -60,3 +59,45 @@ if __name__ == "__main__":
         backtest_engine = BacktestEngine()
         backtest_result = backtest_engine.run(price_df, signals_df)
         plot_backtest_results(backtest_result, show_drawdown=True, show_per_asset=True)
+
+
+# --- BacktestEngine (pytest; the script above needs a loaded database) ---
+
+
+def _synthetic_panel(n_days: int = 120, symbols=("A", "B", "C"), seed: int = 0):
+    """Random-walk prices and random -1/0/+1 int8 signals for a few symbols."""
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range("2024-01-01", periods=n_days)
+    prices = pd.DataFrame(
+        100 * np.exp(np.cumsum(rng.normal(0, 0.01, (n_days, len(symbols))), axis=0)),
+        index=index,
+        columns=list(symbols),
+    )
+    signals = pd.DataFrame(
+        rng.integers(-1, 2, (n_days, len(symbols))).astype(np.int8),
+        index=index,
+        columns=list(symbols),
+    )
+    return prices, signals
+
+
+class TestBacktestEngine:
+    """Tests for BacktestEngine.run on synthetic data."""
+
+    @pytest.mark.parametrize("target_volatility", [None, 0.1])
+    @pytest.mark.parametrize("dtype", [np.int8, np.float64])
+    def test_signal_columns_are_matched_by_label(self, target_volatility, dtype):
+        prices, signals = _synthetic_panel()
+        signals = signals.astype(dtype)
+        engine = BacktestEngine(initial_capital=100_000.0, target_volatility=target_volatility, verbose=False)
+
+        aligned = engine.run(prices, signals)
+        reordered = engine.run(prices, signals[["C", "A", "B"]])
+
+        assert reordered.equity.iloc[-1] == pytest.approx(aligned.equity.iloc[-1], rel=1e-12)
+        pd.testing.assert_frame_equal(reordered.positions, aligned.positions)
+
+    def test_mismatched_signal_columns_raise(self):
+        prices, signals = _synthetic_panel()
+        with pytest.raises(ValueError):
+            BacktestEngine(verbose=False).run(prices, signals.rename(columns={"C": "D"}))
@@ -0,0 +1,174 @@
+"""Tests for the ETL pipeline's incremental loads, on StubSource and a temporary SQLite database."""
+
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, ".")
+
+from datetime import date
+
+from src.data import database
+from src.data.etl.pipeline import ETLPipeline
+from src.data.models import Instrument, IngestionWatermark
+from src.data.sources.stub_source import StubSource
+from src.trading import backtest_helpers
+
+# More symbols than pipeline workers, so loads overlap across threads
+SYMBOLS = [f"ETL{i:02d}" for i in range(12)]
+
+
+class RecordingStubSource(StubSource):
+    """StubSource that records the start date of every fetch."""
+
+    def __init__(self):
+        self.fetch_starts = []
+
+    def fetch_prices(self, symbol, start_date, end_date, validate=True):
+        self.fetch_starts.append(start_date)
+        return super().fetch_prices(symbol, start_date, end_date, validate)
+
+
+class BatchedStubSource(RecordingStubSource):
+    """Adds a fetch_multiple, to exercise the pipeline's prefetch path."""
+
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    def fetch_multiple(self, symbols, start_date, end_date):
+        self.batches.append((tuple(symbols), start_date))
+        return {symbol: self.fetch_prices(symbol, start_date, end_date) for symbol in symbols}
+
+
+def _business_days(start: date, end: date) -> int:
+    return len(pd.bdate_range(start, end))
+
+
+def _watermarks() -> dict:
+    """symbol -> (first_loaded_date, last_loaded_date)."""
+    with database.get_session() as session:
+        rows = (
+            session.query(Instrument.symbol, IngestionWatermark.first_loaded_date, IngestionWatermark.last_loaded_date)
+            .join(IngestionWatermark, IngestionWatermark.instrument_id == Instrument.id)
+            .all()
+        )
+    return {symbol: (first, last) for symbol, first, last in rows}
+
+
+@pytest.fixture
+def temp_database(tmp_path, monkeypatch):
+    """Point the database module at an empty SQLite file for one test."""
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'etl.db'}")
+    monkeypatch.setattr(database, "_engine", None)
+    monkeypatch.setattr(database, "_SessionFactory", None)
+    yield
+    if database._engine is not None:
+        database._engine.dispose()
+
+
+@pytest.fixture(params=[RecordingStubSource, BatchedStubSource])
+def pipeline(request, temp_database):
+    return ETLPipeline(source=request.param())
+
+
+class TestIncrementalLoad:
+    """Inserted/skipped counts and watermark bounds across repeated loads."""
+
+    JAN = (date(2024, 1, 1), date(2024, 1, 31))
+
+    def test_fresh_load(self, pipeline):
+        stats = pipeline.run(SYMBOLS, *self.JAN)
+
+        per_symbol = _business_days(*self.JAN)
+        assert stats['status'] == 'SUCCESS'
+        assert stats['symbols_processed'] == len(SYMBOLS)
+        assert stats['records_inserted'] == per_symbol * len(SYMBOLS)
+        assert stats['records_skipped'] == 0
+        assert _watermarks() == {s: (date(2024, 1, 1), date(2024, 1, 31)) for s in SYMBOLS}
+
+    def test_duplicate_symbols_load_once(self, pipeline):
+        stats = pipeline.run(SYMBOLS[:3] + SYMBOLS[:1], *self.JAN)
+
+        assert stats['status'] == 'SUCCESS'
+        assert stats['symbols_processed'] == 3
+        assert stats['symbols_failed'] == 0
+        assert stats['records_inserted'] == _business_days(*self.JAN) * 3
+        assert _watermarks() == {s: (date(2024, 1, 1), date(2024, 1, 31)) for s in SYMBOLS[:3]}
+
+    def test_extension_refetches_last_loaded_day(self, pipeline):
+        pipeline.run(SYMBOLS, *self.JAN)
+        pipeline.source.fetch_starts.clear()
+        stats = pipeline.run(SYMBOLS, date(2024, 1, 1), date(2024, 2, 29))
+
+        # Only Jan 31 onwards is fetched; the days before it and the
+        # re-fetched Jan 31 all count as skipped
+        assert stats['records_inserted'] == _business_days(date(2024, 2, 1), date(2024, 2, 29)) * len(SYMBOLS)
+        assert stats['records_skipped'] == _business_days(*self.JAN) * len(SYMBOLS)
+        assert _watermarks() == {s: (date(2024, 1, 1), date(2024, 2, 29)) for s in SYMBOLS}
+        assert pipeline.source.fetch_starts == [date(2024, 1, 31)] * len(SYMBOLS)
+        if isinstance(pipeline.source, BatchedStubSource):
+            assert pipeline.source.batches[-1] == (tuple(SYMBOLS), date(2024, 1, 31))
+
+    def test_fully_loaded_range_is_not_fetched(self, pipeline):
+        pipeline.run(SYMBOLS, *self.JAN)
+        pipeline.source.fetch_starts.clear()
+        stats = pipeline.run(SYMBOLS, date(2024, 1, 8), date(2024, 1, 19))
+
+        assert pipeline.source.fetch_starts == []
+        assert stats['records_inserted'] == 0
+        assert stats['records_skipped'] == _business_days(date(2024, 1, 8), date(2024, 1, 19)) * len(SYMBOLS)
+        if isinstance(pipeline.source, BatchedStubSource):
+            assert len(pipeline.source.batches) == 1
+
+    def test_reload_without_skip_existing(self, pipeline):
+        pipeline.run(SYMBOLS, *self.JAN)
+        stats = pipeline.run(SYMBOLS, *self.JAN, skip_existing=False)
+
+        assert stats['records_inserted'] == 0
+        assert stats['records_skipped'] == _business_days(*self.JAN) * len(SYMBOLS)
+        assert _watermarks() == {s: (date(2024, 1, 1), date(2024, 1, 31)) for s in SYMBOLS}
+
+    def test_earlier_overlapping_range_extends_watermark_back(self, pipeline):
+        pipeline.run(SYMBOLS, *self.JAN)
+        stats = pipeline.run(SYMBOLS, date(2023, 12, 1), date(2024, 1, 15))
+
+        assert stats['records_inserted'] == _business_days(date(2023, 12, 1), date(2023, 12, 31)) * len(SYMBOLS)
+        assert stats['records_skipped'] == _business_days(date(2024, 1, 1), date(2024, 1, 15)) * len(SYMBOLS)
+        assert _watermarks() == {s: (date(2023, 12, 1), date(2024, 1, 31)) for s in SYMBOLS}
+
+    def test_earlier_disjoint_range_keeps_watermark(self, pipeline):
+        pipeline.run(SYMBOLS, *self.JAN)
+        stats = pipeline.run(SYMBOLS, date(2023, 11, 1), date(2023, 11, 30))
+
+        # The gap in December must stay visible, so the range does not grow
+        assert stats['records_inserted'] == _business_days(date(2023, 11, 1), date(2023, 11, 30)) * len(SYMBOLS)
+        assert stats['records_skipped'] == 0
+        assert _watermarks() == {s: (date(2024, 1, 1), date(2024, 1, 31)) for s in SYMBOLS}
+
+
+class TestLoadMultiAssetPrices:
+    """Reading the loaded prices back out in batches."""
+
+    def test_batched_load(self, temp_database, monkeypatch):
+        symbols = SYMBOLS[:3]
+        ETLPipeline(source=StubSource()).run(symbols, date(2024, 1, 1), date(2024, 2, 29))
+        monkeypatch.setattr(backtest_helpers, "LOAD_BATCH_SIZE", 7)
+
+        with database.get_session() as session:
+            instruments = session.query(Instrument).all()
+            prices = backtest_helpers.load_multi_asset_prices(session, instruments, symbols)
+            # yield_per is set on the statement, not on the caller's connection
+            assert "yield_per" not in session.connection().get_execution_options()
+
+        assert sorted(prices.columns) == symbols
+        assert len(prices) == _business_days(date(2024, 1, 1), date(2024, 2, 29))
+        assert not prices.isna().to_numpy().any()
+
+    def test_unknown_symbols(self, temp_database):
+        ETLPipeline(source=StubSource()).run(SYMBOLS[:1], date(2024, 1, 1), date(2024, 1, 31))
+
+        with database.get_session() as session:
+            instruments = session.query(Instrument).all()
+            assert backtest_helpers.load_multi_asset_prices(session, instruments, ["NOPE"]) is None
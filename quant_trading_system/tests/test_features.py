@@ -1,7 +1,11 @@
+import os
 import sys
+import warnings
 sys.path.insert(0, ".")
 
+import numpy as np
 import pandas as pd
+from sqlalchemy import select
 
 from src.analytics.features import FeatureEngine,compute_features
 from src.data.database import get_session, init_database 
@@ -15,33 +19,48 @@ with get_session() as session:
     if not instrument:
         raise ValueError("AAPL not found in database")
 
-    prices = session.query(PriceDaily).filter(PriceDaily.instrument_id == instrument.id).all()
-    if not prices:
+    # One Core select read straight into typed columns (no ORM objects)
+    stmt = (
+        select(PriceDaily.date, PriceDaily.open, PriceDaily.high, PriceDaily.low, PriceDaily.close, PriceDaily.volume)
+        .where(PriceDaily.instrument_id == instrument.id)
+        .order_by(PriceDaily.date)
+    )
+    price_df = pd.read_sql_query(stmt, session.connection(), index_col='date')
+    if price_df.empty:
         raise ValueError("No prices found for AAPL")
 
-    price_df = pd.DataFrame({
-        "date": [p.date for p in prices],
-        "open": [p.open for p in prices],
-        "high": [p.high for p in prices],
-        "low": [p.low for p in prices],
-        "close": [p.close for p in prices],
-        "volume": [p.volume for p in prices],
-    })
-    price_df.set_index('date', inplace=True)
-    price_df.sort_index(inplace=True)
-
     engine = FeatureEngine()
     features_df = engine.compute_all(price_df)
     feature_cols = engine.get_feature_names()
     print(features_df.head())
     print(feature_cols)
     print(features_df.shape)
-    print(features_df[feature_cols].tail(20))
-    #print(features_df[feature_cols].describe())
-   # print(features_df[feature_cols].info())
-    print(features_df[feature_cols].isnull().sum())
-    print(features_df[feature_cols].isnull().sum().sum())
-    print(features_df[feature_cols].isnull().sum().sum() / features_df[feature_cols].size)
+    # Project the feature columns and count nulls once for all the prints below
+    features = features_df[feature_cols]
+    # NaN mask and per-column sums on the float array, no boolean DataFrame
+    values = features.to_numpy(dtype=np.float64)
+    null_counts = pd.Series(np.isnan(values).sum(axis=0), index=features.columns)
+    null_total = int(null_counts.sum())
+    print(features.tail(20))
+    # Full-frame statistics only on request (VERBOSE_TEST=1), as NumPy column
+    # reductions over the same array; percentiles also need VERBOSE_STATS=1
+    if os.environ.get("VERBOSE_TEST"):
+        # All-NaN columns (e.g. sma_200 on a short history) give NaN, as describe() does
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            stats = {
+                'count': len(values) - null_counts.to_numpy(),
+                'mean': np.nanmean(values, axis=0),
+                'std': np.nanstd(values, axis=0, ddof=1),
+                'min': np.nanmin(values, axis=0),
+                'max': np.nanmax(values, axis=0),
+            }
+            if os.environ.get("VERBOSE_STATS"):
+                stats.update(zip(['25%', '50%', '75%'], np.nanpercentile(values, [25, 50, 75], axis=0)))
+        print(pd.DataFrame(stats, index=features.columns).T)
+    print(null_counts)
+    print(null_total)
+    print(null_total / features.size)
 
     print('=' * 50)
     print("Testing Signal Generation")
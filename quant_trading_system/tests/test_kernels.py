@@ -0,0 +1,299 @@
+"""Tests for the compiled analytics kernels against their pandas references."""
+
+import importlib
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, ".")
+
+# Modules that bind to src.analytics._kernels at import time; they are
+# re-imported with numba blocked to exercise the plain-Python fallbacks
+_KERNEL_MODULES = (
+    "src.analytics._kernels",
+    "src.analytics.features",
+    "src.analytics.signals",
+    "src.trading.backtest_helpers",
+    "src.trading.backtest",
+)
+
+
+@pytest.fixture(scope="module", params=["numba", "python"])
+def modules(request):
+    """The kernel modules, compiled with numba or as plain Python."""
+    saved = {name: sys.modules.get(name) for name in ("numba", *_KERNEL_MODULES)}
+    if request.param == "numba":
+        pytest.importorskip("numba")
+    else:
+        sys.modules["numba"] = None
+        for name in _KERNEL_MODULES:
+            sys.modules.pop(name, None)
+    try:
+        loaded = SimpleNamespace(
+            kernels=importlib.import_module("src.analytics._kernels"),
+            features=importlib.import_module("src.analytics.features"),
+            signals=importlib.import_module("src.analytics.signals"),
+            helpers=importlib.import_module("src.trading.backtest_helpers"),
+            backtest=importlib.import_module("src.trading.backtest"),
+        )
+        assert loaded.kernels.NUMBA_AVAILABLE == (request.param == "numba")
+        yield loaded
+    finally:
+        # Put the original modules back, including the attributes the
+        # re-import set on their parent packages
+        for name, module in saved.items():
+            if module is None:
+                sys.modules.pop(name, None)
+                continue
+            sys.modules[name] = module
+            parent, _, child = name.rpartition(".")
+            if parent in sys.modules:
+                setattr(sys.modules[parent], child, module)
+
+
+def _close_panel(n_days: int = 300, n_symbols: int = 3, seed: int = 7) -> pd.DataFrame:
+    """Random-walk closes with leading NaNs, an interior NaN gap and a flat stretch."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (n_days, n_symbols)), axis=0))
+    close[:5, 0] = np.nan
+    close[100:103, 1] = np.nan
+    close[200:240, 2] = close[200, 2]
+    return pd.DataFrame(
+        close,
+        index=pd.bdate_range("2023-01-02", periods=n_days),
+        columns=[f"S{j}" for j in range(n_symbols)],
+    )
+
+
+def _reference_rsi(close: pd.Series, window: int = 14) -> pd.Series:
+    """RSI as FeatureEngine computed it with pandas."""
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0)
+    loss = (-delta).where(delta < 0, 0)
+    avg_gain = gain.ewm(alpha=1 / window, adjust=False).mean()
+    avg_loss = loss.ewm(alpha=1 / window, adjust=False).mean()
+    return 100 - (100 / (1 + avg_gain / (avg_loss + 1e-10)))
+
+
+def _reference_atr(high: pd.Series, low: pd.Series, close: pd.Series, window: int = 14) -> pd.Series:
+    """ATR as FeatureEngine computed it with pandas."""
+    prev_close = close.shift(1)
+    true_range = pd.concat(
+        [high - low, (high - prev_close).abs(), (low - prev_close).abs()], axis=1
+    ).max(axis=1)
+    return true_range.ewm(alpha=1 / window, adjust=False).mean()
+
+
+def _reference_backtest(prices: pd.DataFrame, signals: pd.DataFrame, capital: float,
+                        target_volatility, cost_rate: float) -> dict:
+    """The pandas BacktestEngine.run the NumPy/numba version replaced."""
+    positions = signals.shift(1).fillna(0)
+    returns = prices.pct_change().fillna(0)
+    strategy_returns = positions * returns - cost_rate * positions.diff().abs()
+    if target_volatility is not None:
+        rolling_vol = strategy_returns.rolling(window=21).std() * np.sqrt(252)
+        vol_scale = (target_volatility / rolling_vol).clip(0, 2).fillna(1)
+        strategy_returns *= vol_scale
+        positions *= vol_scale
+
+    daily = strategy_returns.mean(axis=1)
+    equity = (1 + daily).cumprod() * capital
+    excess = daily - 0.05 / 252
+    per_asset_equity = (1 + strategy_returns).cumprod() * (capital / prices.shape[1])
+    per_asset_peak = per_asset_equity.cummax()
+    return {
+        "positions": positions,
+        "equity": equity,
+        "total_return": equity.iloc[-1] / capital - 1,
+        "sharpe_ratio": excess.mean() / excess.std() * np.sqrt(252),
+        "max_drawdown": ((equity - equity.cummax()) / equity.cummax()).min(),
+        "win_rate": (daily > 0).sum() / (daily != 0).sum(),
+        "per_asset_equity": per_asset_equity,
+        "per_asset_sharpe": (strategy_returns.mean() / strategy_returns.std()).mul(np.sqrt(252)).fillna(0),
+        "per_asset_max_drawdown": ((per_asset_equity - per_asset_peak) / per_asset_peak).min(),
+        "per_asset_win_rate": ((strategy_returns > 0).sum() / (strategy_returns != 0).sum()).fillna(0),
+    }
+
+
+# --- EWM indicator kernels ---
+
+
+class TestEwmKernels:
+    """Wilder EMA, RSI, ATR and MACD kernels against pandas ewm."""
+
+    def test_wilder_ema_matches_pandas(self, modules):
+        close = _close_panel()["S0"]
+        close.iloc[50] = np.nan
+        result = modules.kernels.wilder_ema(close.to_numpy(), 1 / 14)
+        expected = close.ewm(alpha=1 / 14, adjust=False).mean()
+        np.testing.assert_allclose(result, expected.to_numpy(), rtol=1e-12)
+
+    @pytest.mark.parametrize("symbol", ["S0", "S1", "S2"])
+    def test_rsi_matches_pandas(self, modules, symbol):
+        close = _close_panel()[symbol]
+        result = modules.kernels.rsi_kernel(close.to_numpy(), 14)
+        np.testing.assert_allclose(result, _reference_rsi(close).to_numpy(), rtol=1e-9)
+
+    @pytest.mark.parametrize("symbol", ["S0", "S1", "S2"])
+    def test_atr_matches_pandas(self, modules, symbol):
+        close = _close_panel()[symbol]
+        high, low = close * 1.01, close * 0.99
+        result = modules.kernels.atr_kernel(high.to_numpy(), low.to_numpy(), close.to_numpy(), 14)
+        np.testing.assert_allclose(result, _reference_atr(high, low, close).to_numpy(), rtol=1e-9)
+
+    @pytest.mark.parametrize("symbol", ["S0", "S1", "S2"])
+    def test_macd_matches_pandas(self, modules, symbol):
+        close = _close_panel()[symbol]
+        result = modules.kernels.macd_fused(close.to_numpy(), 2 / 13, 2 / 27, 2 / 10)
+
+        ema_fast = close.ewm(span=12, adjust=False).mean()
+        ema_slow = close.ewm(span=26, adjust=False).mean()
+        line = ema_fast - ema_slow
+        signal = line.ewm(span=9, adjust=False).mean()
+        for got, expected in zip(result, (ema_fast, ema_slow, line, signal, line - signal)):
+            np.testing.assert_allclose(got, expected.to_numpy(), rtol=1e-9, atol=1e-12)
+
+    def test_panel_kernels_match_columns(self, modules):
+        k = modules.kernels
+        panel = _close_panel().to_numpy()
+        high, low = panel * 1.01, panel * 0.99
+        rsi = k.rsi_2d(panel, 14)
+        atr = k.atr_2d(high, low, panel, 14)
+        macd = k.macd_2d(panel, 2 / 13, 2 / 27, 2 / 10)
+        for j in range(panel.shape[1]):
+            column = np.ascontiguousarray(panel[:, j])
+            np.testing.assert_array_equal(rsi[:, j], k.rsi_kernel(column, 14))
+            np.testing.assert_array_equal(
+                atr[:, j],
+                k.atr_kernel(np.ascontiguousarray(high[:, j]), np.ascontiguousarray(low[:, j]), column, 14),
+            )
+            for got, expected in zip(macd, k.macd_fused(column, 2 / 13, 2 / 27, 2 / 10)):
+                np.testing.assert_array_equal(got[:, j], expected)
+
+
+# --- Rolling kernels ---
+
+
+class TestRollingKernels:
+    """Running-sum rolling mean and Welford rolling std against pandas rolling."""
+
+    @pytest.mark.parametrize("window", [1, 5, 21, 400])
+    def test_rolling_mean_matches_pandas(self, modules, window):
+        prices = _close_panel()
+        result = modules.kernels.rolling_mean_2d(prices.to_numpy(), window)
+        expected = prices.rolling(window).mean().to_numpy()
+        np.testing.assert_allclose(result, expected, rtol=1e-9)
+
+    @pytest.mark.parametrize("ddof", [0, 1])
+    @pytest.mark.parametrize("window", [1, 5, 21, 400])
+    def test_rolling_std_matches_pandas(self, modules, window, ddof):
+        prices = _close_panel()
+        result = modules.kernels.rolling_std_2d(prices.to_numpy(), window, ddof)
+        expected = prices.rolling(window).std(ddof=ddof).to_numpy()
+        # On the flat stretch pandas can leave ~1e-7 of rounding residue where the kernel gives 0
+        np.testing.assert_allclose(result, expected, rtol=1e-7, atol=1e-6)
+
+    def test_flat_window_is_exact(self, modules):
+        # Windows inside the flat stretch give exactly the value and exactly 0, as in pandas
+        prices = _close_panel()
+        flat = prices["S2"].iloc[200]
+        mean = modules.kernels.rolling_mean_2d(prices.to_numpy(), 20)
+        std = modules.kernels.rolling_std_2d(prices.to_numpy(), 20, 0)
+        assert (mean[219:240, 2] == flat).all()
+        assert (std[219:240, 2] == 0.0).all()
+
+    def test_feature_engine_matches_pandas(self, modules):
+        prices = _close_panel()
+        features = modules.features.FeatureEngine().compute_all_multi(prices)
+        log_returns = np.log(prices / prices.shift(1))
+        checks = {
+            "sma_21": prices.rolling(21).mean(),
+            "sma_200": prices.rolling(200).mean(),
+            "volatility_21d": log_returns.rolling(21).std(ddof=0) * np.sqrt(252),
+            "rsi_14": prices.apply(_reference_rsi),
+            "ema_12": prices.ewm(span=12, adjust=False).mean(),
+        }
+        for name, expected in checks.items():
+            np.testing.assert_allclose(
+                features[name].to_numpy(), expected.to_numpy(), rtol=1e-7, atol=1e-8, err_msg=name
+            )
+
+
+# --- Signal kernel ---
+
+
+class TestSignalKernel:
+    """build_signals_nb against SignalCombiner.generate run one symbol at a time."""
+
+    @pytest.mark.parametrize("weights", [None, {"momentum": 2.0, "rsi": 1.0, "macd": 0.5}])
+    def test_build_signals_matches_per_symbol_generate(self, modules, weights):
+        s = modules.signals
+        prices = _close_panel()
+        combiner = s.SignalCombiner(
+            signals={
+                "momentum": s.MomentumSignal(window=21),
+                "rsi": s.RSISignal(oversold=30, overbought=70),
+                "macd": s.MACDSignal(),
+            },
+            weights=weights,
+        )
+        engine = modules.features.FeatureEngine()
+        result = modules.helpers.build_signals(engine, prices, combiner)
+
+        assert result.dtypes.eq(np.int8).all()
+        for symbol in prices.columns:
+            expected = modules.helpers.build_signals_for_symbol(engine, prices[symbol], combiner)
+            np.testing.assert_array_equal(result[symbol].to_numpy(), expected.to_numpy(), err_msg=symbol)
+
+
+# --- Backtest kernels ---
+
+
+class TestBacktestKernels:
+    """Strategy-return, vol-target and per-asset stats kernels against the pandas backtest."""
+
+    @staticmethod
+    def _panel():
+        prices = _close_panel().drop(columns="S1")
+        rng = np.random.default_rng(11)
+        signals = pd.DataFrame(
+            rng.integers(-1, 2, prices.shape).astype(np.int8), index=prices.index, columns=prices.columns
+        )
+        return prices, signals
+
+    @pytest.mark.parametrize("dtype", [np.int8, np.float32])
+    def test_strategy_returns_matches_pandas(self, modules, dtype):
+        prices, signals = self._panel()
+        positions, strategy_returns, changes = modules.kernels.strategy_returns_kernel(
+            prices.to_numpy(), signals.to_numpy(dtype=dtype), 0.002
+        )
+        expected_positions = signals.astype(float).shift(1).fillna(0)
+        expected_changes = expected_positions.diff().abs()
+        expected = expected_positions * prices.pct_change().fillna(0) - 0.002 * expected_changes
+
+        np.testing.assert_array_equal(positions, expected_positions.to_numpy())
+        np.testing.assert_array_equal(changes, expected_changes.fillna(0).to_numpy())
+        np.testing.assert_allclose(strategy_returns, expected.to_numpy(), rtol=1e-5, atol=1e-7)
+
+    @pytest.mark.parametrize("target_volatility", [None, 0.1])
+    def test_run_matches_pandas(self, modules, target_volatility):
+        prices, signals = self._panel()
+        engine = modules.backtest.BacktestEngine(
+            initial_capital=100_000.0, target_volatility=target_volatility, verbose=False
+        )
+        result = engine.run(prices, signals)
+        expected = _reference_backtest(
+            prices, signals.astype(float), 100_000.0, target_volatility, engine.transaction_costs + engine.slippage
+        )
+
+        for name, value in expected.items():
+            got = getattr(result, name)
+            if isinstance(value, (pd.Series, pd.DataFrame)):
+                np.testing.assert_allclose(
+                    got.to_numpy(dtype=float), value.to_numpy(dtype=float), rtol=1e-4, atol=1e-6, err_msg=name
+                )
+            else:
+                assert got == pytest.approx(value, rel=1e-4), name
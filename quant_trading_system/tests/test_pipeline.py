@@ -4,6 +4,7 @@ import sys
 sys.path.insert(0, ".")
 
 from datetime import date, timedelta
+from sqlalchemy import func
 from src.data.etl.pipeline import ETLPipeline
 from src.data.database import get_session, init_database 
 from src.data.models import Instrument, PriceDaily, DataLoadLog, DataLoadSymbol
@@ -54,9 +55,14 @@ with get_session() as session:
 
     #check price counts per symbol
     print(f"\nPrice counts per symbol:")
+    # one GROUP BY for all instruments instead of a COUNT query per symbol
+    counts = dict(
+        session.query(PriceDaily.instrument_id, func.count())
+        .group_by(PriceDaily.instrument_id)
+        .all()
+    )
     for inst in instruments:
-        count = session.query(PriceDaily).filter_by(instrument_id=inst.id).count()
-        print(f"  - {inst.symbol}: {count} days")
+        print(f"  - {inst.symbol}: {counts.get(inst.id, 0)} days")
 
     #check job log
     logs = session.query(DataLoadLog).order_by(DataLoadLog.started_at.desc()).limit(5).all()
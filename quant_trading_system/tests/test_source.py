@@ -3,6 +3,7 @@
 import os
 import sys
 
+import numpy as np
 import pytest
 
 sys.path.insert(0, ".")
@@ -27,8 +28,9 @@ except Exception:
 class TestStubSource:
     """Tests for the stub / synthetic data source."""
 
-    @pytest.fixture
-    def source(self):
+    @pytest.fixture(scope="class")
+    @classmethod
+    def source(cls):
         return StubSource()
 
     def test_source_name(self, source):
@@ -61,14 +63,21 @@ class TestStubSource:
         end = date(2024, 1, 5)
         df1 = source.fetch_prices("A", start, end)
         df2 = source.fetch_prices("A", start, end)
-        assert list(df1["close"]) == list(df2["close"])
+        assert np.array_equal(df1["close"].to_numpy(), df2["close"].to_numpy())
 
     def test_fetch_prices_different_symbols_differ(self, source):
         start = date(2024, 1, 1)
         end = date(2024, 1, 5)
         df_a = source.fetch_prices("SYM_A", start, end)
         df_b = source.fetch_prices("SYM_B", start, end)
-        assert list(df_a["close"]) != list(df_b["close"])
+        assert not np.array_equal(df_a["close"].to_numpy(), df_b["close"].to_numpy())
+
+    def test_fetch_prices_unvalidated_matches_validated(self, source):
+        start = date(2024, 1, 1)
+        end = date(2024, 3, 31)
+        df = source.fetch_prices("STUB1", start, end)
+        raw = source.fetch_prices("STUB1", start, end, validate=False)
+        assert raw.equals(df)
 
     def test_fetch_prices_empty_range_raises(self, source):
         start = date(2024, 1, 6)  # Saturday
@@ -108,8 +117,9 @@ class TestFREDSourceNoKey:
 class TestFREDSource:
     """Integration tests for FRED when fredapi is installed and FRED_API_KEY is set."""
 
-    @pytest.fixture
-    def source(self):
+    @pytest.fixture(scope="class")
+    @classmethod
+    def source(cls):
         return FREDSource()
 
     def test_source_name(self, source):
@@ -149,8 +159,9 @@ class TestFREDSource:
 class TestYFinanceSource:
     """Integration-style tests for Yahoo Finance (requires network)."""
 
-    @pytest.fixture
-    def source(self):
+    @pytest.fixture(scope="class")
+    @classmethod
+    def source(cls):
         return YFinanceSource()
 
     def test_source_name(self, source):